@@ -0,0 +1,294 @@
+import math
+from abc import ABC, abstractmethod
+from array import array
+from operator import mul
+from typing import Any, Dict, List, Optional, Sequence
+
+from project import matrix_operation, vector_operation
+from project.matrix_operation import Matrix, MatrixLike, SparseMatrix
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None  # type: ignore
+
+# Inputs with at least this many elements in total are sent to the NumPy
+# backend, if it is available, even when given as lists: below this size
+# converting the data costs more than the vectorized computation saves.
+NUMPY_THRESHOLD = 4096
+
+
+class Backend(ABC):
+    """A compute engine for vector and matrix operations.
+
+    Subclasses implement the operations for the input types they support.
+    Every backend accepts the same inputs as the reference implementations
+    in project.vector_operation and project.matrix_operation, raises the same
+    errors and returns results of the same representation as its inputs.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def dot_product(self, a: Sequence[float], b: Sequence[float]) -> float:
+        """Calculates the dot product of two vectors."""
+
+    def vector_length(self, c: Sequence[float]) -> float:
+        return math.sqrt(self.dot_product(c, c))
+
+    def angle_between_vectors(self, a: Sequence[float], b: Sequence[float]) -> float:
+        len_a = self.vector_length(a)
+        len_b = self.vector_length(b)
+        if len_a == 0 or len_b == 0:
+            raise ValueError("One of the vectors is zero.")
+        cos_theta = self.dot_product(a, b) / (len_a * len_b)
+        return math.acos(max(-1, min(1, cos_theta)))
+
+    @abstractmethod
+    def add_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        """Adds two matrices."""
+
+    @abstractmethod
+    def multiply_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        """Multiplies two matrices."""
+
+    @abstractmethod
+    def transpose(self, matrix: Any) -> Any:
+        """Transposes a matrix."""
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class PythonBackend(Backend):
+    """The pure-Python reference implementations."""
+
+    name = "python"
+
+    def dot_product(self, a: Sequence[float], b: Sequence[float]) -> float:
+        return vector_operation.dot_product(a, b)
+
+    def vector_length(self, c: Sequence[float]) -> float:
+        return vector_operation.vector_length(c)
+
+    def angle_between_vectors(self, a: Sequence[float], b: Sequence[float]) -> float:
+        return vector_operation.angle_between_vectors(a, b)
+
+    def add_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        return matrix_operation.add_matrices(matrix1, matrix2)
+
+    def multiply_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        return matrix_operation.multiply_matrices(matrix1, matrix2)
+
+    def transpose(self, matrix: Any) -> Any:
+        return matrix_operation.transpose(matrix)
+
+
+class ArrayBackend(Backend):
+    """Operations on flat ``array('d')`` storage.
+
+    Nested lists are packed into a Matrix before computing and unpacked
+    afterwards, so this backend pays off mostly for inputs that are already
+    arrays, memoryviews or Matrix instances.
+    """
+
+    name = "array"
+
+    def dot_product(self, a: Sequence[float], b: Sequence[float]) -> float:
+        if len(a) != len(b):
+            raise ValueError("Vectors must have the same length.")
+        return sum(map(mul, a, b))
+
+    def add_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        result = matrix_operation.add_matrices(_packed(matrix1), _packed(matrix2))
+        return _unpacked(result, matrix1, matrix2)
+
+    def multiply_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        result = matrix_operation.multiply_matrices(_packed(matrix1), _packed(matrix2))
+        return _unpacked(result, matrix1, matrix2)
+
+    def transpose(self, matrix: Any) -> Any:
+        if isinstance(matrix, list):
+            return Matrix.from_lists(matrix).T.tolist() if matrix else []
+        return matrix.T
+
+
+def _packed(matrix: MatrixLike) -> MatrixLike:
+    """Converts a non-empty list of rows to a Matrix."""
+    if isinstance(matrix, list) and matrix:
+        return Matrix.from_lists(matrix)
+    return matrix
+
+
+def _unpacked(result: Any, matrix1: Any, matrix2: Any) -> Any:
+    """Converts a result back to lists unless an operand was a Matrix."""
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        return result
+    return result.tolist()
+
+
+class NumpyBackend(Backend):
+    """Vectorized operations with NumPy.
+
+    Lists and other sequences are converted to float64 arrays, and Matrix
+    instances are viewed as arrays without copying. Results are returned as
+    ndarrays if an operand was an ndarray, as a Matrix if an operand was a
+    Matrix, and as lists otherwise.
+    """
+
+    name = "numpy"
+
+    def __init__(self) -> None:
+        if numpy is None:
+            raise ImportError("NumPy is not installed.")
+
+    def dot_product(self, a: Sequence[float], b: Sequence[float]) -> float:
+        if len(a) != len(b):
+            raise ValueError("Vectors must have the same length.")
+        return float(numpy.dot(_as_array(a), _as_array(b)))
+
+    def add_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        array1, array2 = _as_array(matrix1), _as_array(matrix2)
+        if array1.ndim != 2 or array1.size == 0 or array1.shape != array2.shape:
+            raise ValueError("Matrices must be of the same dimensions and non-empty")
+        return _result(array1 + array2, matrix1, matrix2)
+
+    def multiply_matrices(self, matrix1: Any, matrix2: Any) -> Any:
+        array1, array2 = _as_array(matrix1), _as_array(matrix2)
+        if array1.ndim != 2 or array2.ndim != 2 or not array1.size or not array2.size:
+            raise ValueError("Matrices cannot be empty.")
+        if array1.shape[1] != array2.shape[0]:
+            raise ValueError("Incompatible matrices for multiplication.")
+        return _result(array1 @ array2, matrix1, matrix2)
+
+    def transpose(self, matrix: Any) -> Any:
+        if isinstance(matrix, (Matrix, numpy.ndarray)):
+            return matrix.T  # Both are strided views
+        if not len(matrix):
+            return []
+        return _as_array(matrix).T.tolist()
+
+
+def _as_array(operand: Any) -> Any:
+    """Converts an operand to a float64 ndarray, without copying if possible."""
+    if isinstance(operand, Matrix):
+        rows, columns = operand.shape
+        flat = numpy.frombuffer(
+            operand.data, dtype=numpy.float64  # type: ignore[arg-type]
+        )
+        return numpy.lib.stride_tricks.as_strided(
+            flat[operand.offset :],
+            shape=(rows, columns),
+            strides=(8 * operand.strides[0], 8 * operand.strides[1]),
+            writeable=False,
+        )
+    return numpy.asarray(operand, dtype=numpy.float64)
+
+
+def _result(result: Any, *operands: Any) -> Any:
+    """Converts an ndarray result to the representation of the operands."""
+    if any(isinstance(operand, numpy.ndarray) for operand in operands):
+        return result
+    if any(isinstance(operand, Matrix) for operand in operands):
+        data = array("d")
+        data.frombytes(numpy.ascontiguousarray(result).tobytes())
+        return Matrix(data, result.shape)
+    return result.tolist()
+
+
+_backends: Dict[str, Backend] = {}
+
+
+def register_backend(backend: Backend) -> None:
+    """Makes a backend available for selection under its name."""
+    _backends[backend.name] = backend
+
+
+def get_backend(name: str) -> Backend:
+    """
+    Returns a registered backend.
+
+    Raises:
+        KeyError: If no backend with this name is registered.
+    """
+    return _backends[name]
+
+
+def available_backends() -> List[str]:
+    """Returns the names of the registered backends."""
+    return list(_backends)
+
+
+register_backend(PythonBackend())
+register_backend(ArrayBackend())
+if numpy is not None:
+    register_backend(NumpyBackend())
+
+
+def _size(operand: Any) -> int:
+    """Returns the number of elements in a vector or matrix."""
+    if isinstance(operand, (Matrix, SparseMatrix)):
+        return operand.shape[0] * operand.shape[1]
+    if numpy is not None and isinstance(operand, numpy.ndarray):
+        return int(operand.size)
+    if len(operand) and isinstance(operand[0], (list, tuple)):
+        return len(operand) * len(operand[0])
+    return len(operand)
+
+
+def select_backend(*operands: Any) -> Backend:
+    """
+    Chooses the backend for a call from the types and sizes of its operands.
+
+    Sparse matrices always use the reference implementation. NumPy arrays,
+    and inputs of at least NUMPY_THRESHOLD elements, use NumPy when it is
+    available. Other arrays, memoryviews and Matrix instances use the
+    array backend, and everything else the reference implementation.
+
+    Returns:
+        Backend: The selected backend.
+    """
+    if any(isinstance(operand, SparseMatrix) for operand in operands):
+        return _backends["python"]
+    if "numpy" in _backends and (
+        any(isinstance(operand, numpy.ndarray) for operand in operands)
+        or sum(map(_size, operands)) >= NUMPY_THRESHOLD
+    ):
+        return _backends["numpy"]
+    if any(isinstance(operand, (array, memoryview, Matrix)) for operand in operands):
+        return _backends["array"]
+    return _backends["python"]
+
+
+def _backend(name: Optional[str], *operands: Any) -> Backend:
+    return get_backend(name) if name is not None else select_backend(*operands)
+
+
+def dot_product(a: Any, b: Any, backend: Optional[str] = None) -> float:
+    """Calculates the dot product of two vectors with the selected backend."""
+    return _backend(backend, a, b).dot_product(a, b)
+
+
+def vector_length(c: Any, backend: Optional[str] = None) -> float:
+    """Calculates the length of a vector with the selected backend."""
+    return _backend(backend, c).vector_length(c)
+
+
+def angle_between_vectors(a: Any, b: Any, backend: Optional[str] = None) -> float:
+    """Calculates the angle between two vectors with the selected backend."""
+    return _backend(backend, a, b).angle_between_vectors(a, b)
+
+
+def add_matrices(matrix1: Any, matrix2: Any, backend: Optional[str] = None) -> Any:
+    """Adds two matrices with the selected backend."""
+    return _backend(backend, matrix1, matrix2).add_matrices(matrix1, matrix2)
+
+
+def multiply_matrices(matrix1: Any, matrix2: Any, backend: Optional[str] = None) -> Any:
+    """Multiplies two matrices with the selected backend."""
+    return _backend(backend, matrix1, matrix2).multiply_matrices(matrix1, matrix2)
+
+
+def transpose(matrix: Any, backend: Optional[str] = None) -> Any:
+    """Transposes a matrix with the selected backend."""
+    return _backend(backend, matrix).transpose(matrix)
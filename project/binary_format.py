@@ -0,0 +1,197 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterator, Sequence, Tuple
+
+from project.matrix_operation import Buffer, Matrix, MatrixLike
+
+# A file starts with a fixed-size header followed by the raw payload:
+#
+#   magic       4 bytes   b"SPBM"
+#   version     1 byte    FORMAT_VERSION
+#   dtype       1 byte    b"d" (float64)
+#   byte order  1 byte    b"<" (little-endian) or b">" (big-endian)
+#   ndim        1 byte    1 for vectors, 2 for matrices
+#   shape       2 x u64   little-endian; the second value is 0 for vectors
+#
+# The payload holds the elements in row-major order in the byte order from
+# the header. The header is 24 bytes long, so the payload stays aligned to
+# eight bytes and can be viewed in place through mmap.
+
+MAGIC = b"SPBM"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBccB2Q")
+HEADER_SIZE = _HEADER.size
+
+_NATIVE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def _write(file: BinaryIO, shape: Tuple[int, int], ndim: int) -> None:
+    """Writes a header for a float64 payload in native byte order."""
+    file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, b"d", _NATIVE_ORDER, ndim, *shape))
+
+
+def save_matrix(path: str, matrix: MatrixLike) -> None:
+    """Writes a matrix to a binary file.
+
+    Args:
+        path (str): The file to write.
+        matrix (MatrixLike): The matrix, as a list of rows or a Matrix.
+
+    Raises:
+        ValueError: If the rows have different lengths.
+    """
+    if isinstance(matrix, Matrix):
+        shape = matrix.shape
+    else:
+        shape = (len(matrix), len(matrix[0]) if matrix else 0)
+        if any(len(row) != shape[1] for row in matrix):
+            raise ValueError("All rows must have the same length.")
+
+    with open(path, "wb") as file:
+        _write(file, shape, 2)
+        if isinstance(matrix, Matrix) and matrix.is_contiguous():
+            file.write(matrix.data)
+        else:
+            for row in matrix:
+                file.write(array("d", row))
+
+
+def save_vector(path: str, vector: Sequence[float]) -> None:
+    """Writes a vector to a binary file.
+
+    Args:
+        path (str): The file to write.
+        vector (Sequence[float]): The vector.
+    """
+    with open(path, "wb") as file:
+        _write(file, (len(vector), 0), 1)
+        file.write(array("d", vector))
+
+
+def _read_header(file: BinaryIO, path: str, ndim: int) -> Tuple[bytes, int, int, int]:
+    """Reads and validates the header of an open binary file.
+
+    Returns:
+        Tuple[bytes, int, int, int]: The byte order of the payload, the stored
+        shape and the number of elements.
+
+    Raises:
+        ValueError: If the file is not in this format, stores another
+            dtype or number of dimensions, or is truncated.
+    """
+    header = file.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError(f"File {path} is too short for a header.")
+    magic, version, dtype, order, stored_ndim, rows, columns = _HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"File {path} is not in a supported binary format.")
+    if dtype != b"d" or order not in (b"<", b">"):
+        raise ValueError(f"File {path} does not store float64 values.")
+    if stored_ndim != ndim:
+        raise ValueError(f"File {path} stores a {stored_ndim}-dimensional array.")
+
+    count = rows * columns if ndim == 2 else rows
+    if os.fstat(file.fileno()).st_size != HEADER_SIZE + 8 * count:
+        raise ValueError(f"File {path} does not match the size in its header.")
+    return order, rows, columns, count
+
+
+def _load(path: str, ndim: int, writable: bool) -> Tuple[Buffer, Tuple[int, int]]:
+    """Maps the payload of a binary file and returns it with the stored shape.
+
+    The payload is viewed in place unless its byte order differs from the
+    native one, in which case it is copied and converted.
+
+    Raises:
+        ValueError: If the file does not hold an array of ndim dimensions
+            in this format.
+    """
+    with open(path, "rb") as file:
+        order, rows, columns, count = _read_header(file, path, ndim)
+        if not count:
+            return array("d"), (rows, columns)
+
+        access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+        mapping = mmap.mmap(file.fileno(), 0, access=access)
+
+    data = memoryview(mapping)[HEADER_SIZE:].cast("d")
+    if order != _NATIVE_ORDER:
+        swapped = array("d", data)
+        swapped.byteswap()
+        return swapped, (rows, columns)
+    return data, (rows, columns)
+
+
+def load_matrix(path: str, writable: bool = False) -> Matrix:
+    """Loads a matrix from a binary file without copying its elements.
+
+    The returned Matrix is backed by a memory-mapped view of the file, so
+    loading takes the same time regardless of the matrix size. The pages are
+    read from disk when elements are first accessed.
+
+    Args:
+        path (str): The file to read.
+        writable (bool): If True, the matrix can be modified. Changes are
+            private to this process and never written back to the file.
+
+    Raises:
+        ValueError: If the file does not hold a matrix in this format.
+
+    Returns:
+        Matrix: The loaded matrix.
+    """
+    data, shape = _load(path, 2, writable)
+    return Matrix(data, shape)
+
+
+def load_vector(path: str, writable: bool = False) -> Buffer:
+    """Loads a vector from a binary file without copying its elements.
+
+    The result supports len(), indexing and iteration, so it can be passed
+    to the functions in project.vector_operation directly.
+
+    Args:
+        path (str): The file to read.
+        writable (bool): If True, the vector can be modified. Changes are
+            private to this process and never written back to the file.
+
+    Raises:
+        ValueError: If the file does not hold a vector in this format.
+
+    Returns:
+        Buffer: A float64 view of the file contents.
+    """
+    data, _ = _load(path, 1, writable)
+    return data
+
+
+def iter_vector_file(path: str, chunk_size: int = 4096) -> Iterator[float]:
+    """Reads the elements of a vector file one block at a time.
+
+    Only chunk_size elements are held in memory at once, so the result can
+    be passed to stream_dot_product and stream_vector_length for vectors
+    of any length.
+
+    Args:
+        path (str): The file to read.
+        chunk_size (int): The number of elements read at a time.
+
+    Raises:
+        ValueError: If the file does not hold a vector in this format.
+
+    Yields:
+        float: The elements of the vector.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    with open(path, "rb") as file:
+        order, _, _, count = _read_header(file, path, 1)
+        while count:
+            chunk = array("d", file.read(8 * min(chunk_size, count)))
+            if order != _NATIVE_ORDER:
+                chunk.byteswap()
+            count -= len(chunk)
+            yield from chunk
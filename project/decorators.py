@@ -1,27 +1,733 @@
-from typing import Callable, Any, OrderedDict, Tuple, Dict
+import asyncio
+import contextlib
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+import types
+from array import array
+from collections import deque
+from typing import (
+    Callable,
+    Any,
+    ContextManager,
+    Hashable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    OrderedDict,
+    Sequence,
+    Tuple,
+    Dict,
+    Union,
+)
+
+from project.disk_cache import DiskCache
+from project.matrix_operation import Matrix, SparseMatrix
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a function cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    max_size: int
+    current_size: int
+    disk_hits: int = 0
+
+
+_MISSING = object()
+
+
+CacheKey = Hashable
+
+
+def args_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> CacheKey:
+    """Builds a cache key from hashable call arguments."""
+    return args, frozenset(kwargs.items())
+
+
+_ATOMS = frozenset({int, float, complex, bool, str, bytes, type(None)})
+
+
+def freeze(obj: Any) -> Hashable:
+    """
+    Converts an object to a hashable value that is equal for equal contents.
+
+    Lists, tuples, dicts and sets are converted recursively and tagged with
+    their kind, so that e.g. a list and a tuple with the same items differ.
+    The items of dicts and sets are sorted, so that the result pickles the
+    same way in every process regardless of hash randomization.
+    Buffers (arrays, memoryviews, Matrix and SparseMatrix instances, NumPy
+    arrays) are reduced to their shape and raw bytes.
+
+    Args:
+        obj (Any): The object to convert.
+
+    Returns:
+        Hashable: The frozen contents.
+
+    Raises:
+        TypeError: If the object is neither supported nor hashable.
+    """
+    kind = type(obj)
+    if kind in _ATOMS:
+        return obj
+    if kind is list or kind is tuple:
+        items = tuple(obj)
+        # Fast path for flat sequences, such as matrix rows
+        if not _ATOMS.issuperset(map(type, items)):
+            items = tuple(map(freeze, items))
+        return (kind.__name__, items)
+    if isinstance(obj, dict):
+        return ("dict", _sorted((freeze(k), freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (set, frozenset)):
+        return ("set", _sorted(map(freeze, obj)))
+    if isinstance(obj, Matrix):
+        data = obj.data if obj.is_contiguous() else obj.copy().data
+        return ("Matrix", obj.shape, bytes(data))
+    if isinstance(obj, SparseMatrix):
+        return (
+            "SparseMatrix",
+            obj.shape,
+            obj.indptr.tobytes(),
+            obj.indices.tobytes(),
+            obj.values.tobytes(),
+        )
+    if isinstance(obj, array):
+        return ("array", obj.typecode, obj.tobytes())
+    if isinstance(obj, memoryview):
+        return ("memoryview", obj.format, obj.shape, obj.tobytes())
+    if hasattr(obj, "tobytes") and hasattr(obj, "dtype") and hasattr(obj, "shape"):
+        return ("ndarray", str(obj.dtype), tuple(obj.shape), obj.tobytes())
+    try:
+        hash(obj)
+    except TypeError:
+        raise TypeError(f"Cannot build a cache key for {kind.__name__}.") from None
+    return obj
+
+
+def _sorted(items: Iterable[Hashable]) -> Tuple[Hashable, ...]:
+    """Sorts frozen items, by their representation if they are not comparable."""
+    items = list(items)
+    try:
+        return tuple(sorted(items))  # type: ignore[type-var]
+    except TypeError:
+        return tuple(sorted(items, key=repr))
+
+
+class ContentKey:
+    """
+    A cache key fingerprinting call arguments by their contents.
+
+    The hash is computed once from the frozen arguments, and keys with equal
+    hashes are still compared item by item, so collisions cannot mix up
+    results.
+    """
+
+    __slots__ = ("value", "hash")
+
+    def __init__(self, value: Hashable) -> None:
+        self.value = value
+        self.hash = hash(value)
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ContentKey)
+            and self.hash == other.hash
+            and self.value == other.value
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # String hashes differ between processes, so the hash is not pickled
+        return ContentKey, (self.value,)
+
+    def __repr__(self) -> str:
+        return f"ContentKey({self.value!r})"
+
+
+def content_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> CacheKey:
+    """
+    Builds a cache key from the contents of the call arguments.
+
+    Unlike args_key, it accepts lists, dicts, arrays and matrices. Building
+    the key takes time linear in the size of the arguments.
+    """
+    return ContentKey((freeze(args), freeze(kwargs)))
+
+
+KeyBuilder = Callable[[Tuple[Any, ...], Dict[str, Any]], CacheKey]
+
+_KEY_BUILDERS: Dict[str, KeyBuilder] = {"args": args_key, "content": content_key}
+
+
+def _key_builder(key: Union[str, Callable[..., Hashable]]) -> KeyBuilder:
+    """Resolves the key argument of cache_result to a key builder."""
+    if isinstance(key, str):
+        if key not in _KEY_BUILDERS:
+            raise ValueError(f"Unknown key builder {key!r}.")
+        return _KEY_BUILDERS[key]
+    return lambda args, kwargs: key(*args, **kwargs)
+
+
+class EvictionPolicy:
+    """
+    A rule deciding which entries a cache_result cache must drop.
+
+    The cache notifies the policy about every added and removed entry and
+    asks it which entries to drop. All hooks must run in amortized constant
+    time, so that the cache is never scanned as a whole. A policy instance
+    keeps per-cache state and must not be shared between decorated functions.
+    """
+
+    def admits(self, result: Any) -> bool:
+        """Checks whether a result may be cached at all."""
+        return True
+
+    def added(self, key: CacheKey, result: Any) -> None:
+        """Called after an entry has been added to the cache."""
+
+    def removed(self, key: CacheKey) -> None:
+        """Called after an entry has been removed from the cache."""
+
+    def expired(self, key: CacheKey) -> bool:
+        """Checks whether a cached entry must no longer be returned."""
+        return False
+
+    def expired_keys(self) -> Iterator[CacheKey]:
+        """Yields entries that must be dropped regardless of the cache size."""
+        return iter(())
+
+    def over_limit(self) -> bool:
+        """Checks whether least recently used entries must be dropped."""
+        return False
+
+    def clear(self) -> None:
+        """Forgets all entries."""
+
+
+class MaxEntries(EvictionPolicy):
+    """Limits the number of cached results."""
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries <= 0:
+            raise ValueError("Maximum number of entries must be positive.")
+        self.max_entries = max_entries
+        self.entries = 0
+
+    def added(self, key: CacheKey, result: Any) -> None:
+        self.entries += 1
+
+    def removed(self, key: CacheKey) -> None:
+        self.entries -= 1
+
+    def over_limit(self) -> bool:
+        return self.entries > self.max_entries
+
+    def clear(self) -> None:
+        self.entries = 0
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimates the memory taken by an object and the objects it contains.
+
+    Nested lists, tuples, sets and dicts are followed recursively. Objects
+    with a ``data`` buffer, such as Matrix, are measured by their buffer.
+
+    Args:
+        obj (Any): The object to measure.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(getattr(obj, "data", None), (array, memoryview)):
+        size += (
+            obj.data.nbytes
+            if isinstance(obj.data, memoryview)
+            else sys.getsizeof(obj.data)
+        )
+    return size
+
+
+class MaxBytes(EvictionPolicy):
+    """Limits the total estimated size of cached results."""
+
+    def __init__(
+        self, max_bytes: int, size_of: Callable[[Any], int] = estimate_size
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("Memory budget must be positive.")
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.sizes: Dict[CacheKey, int] = {}
+        self.total = 0
+        # The result measured by admits, reused by added to avoid a second walk
+        self.measured: Optional[Tuple[Any, int]] = None
+
+    def admits(self, result: Any) -> bool:
+        size = self.size_of(result)
+        self.measured = (result, size)
+        return size <= self.max_bytes
+
+    def added(self, key: CacheKey, result: Any) -> None:
+        measured, self.measured = self.measured, None
+        if measured is not None and measured[0] is result:
+            size = measured[1]
+        else:
+            size = self.size_of(result)
+        self.sizes[key] = size
+        self.total += size
+
+    def removed(self, key: CacheKey) -> None:
+        self.total -= self.sizes.pop(key)
+
+    def over_limit(self) -> bool:
+        return self.total > self.max_bytes
+
+    def clear(self) -> None:
+        self.sizes.clear()
+        self.total = 0
+        self.measured = None
+
+
+class TimeToLive(EvictionPolicy):
+    """
+    Expires every cached result a fixed time after it was calculated.
+
+    Since all entries live equally long, they expire in insertion order, so
+    expired entries are found by looking at the oldest ones only.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if ttl <= 0:
+            raise ValueError("Time to live must be positive.")
+        self.ttl = ttl
+        self.clock = clock
+        self.deadlines: Dict[CacheKey, float] = {}
+        self.queue: Deque[Tuple[float, CacheKey]] = deque()
+
+    def added(self, key: CacheKey, result: Any) -> None:
+        deadline = self.deadlines[key] = self.clock() + self.ttl
+        self.queue.append((deadline, key))
+
+    def removed(self, key: CacheKey) -> None:
+        del self.deadlines[key]
+
+    def expired(self, key: CacheKey) -> bool:
+        return self.deadlines[key] <= self.clock()
+
+    def expired_keys(self) -> Iterator[CacheKey]:
+        now = self.clock()
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            deadline, key = queue.popleft()
+            # Skip records of entries that were removed or stored again
+            if self.deadlines.get(key) == deadline:
+                yield key
+
+    def clear(self) -> None:
+        self.deadlines.clear()
+        self.queue.clear()
+
+
+class _Flight:
+    """A computation of one cache key that other callers may wait for."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class CachedFunction:
+    """
+    A function wrapped by cache_result.
+
+    Calling it returns cached results when available. The cache and its
+    statistics can be inspected with cache_info and reset with cache_clear.
+
+    Entries are dropped according to the eviction policies: expired entries
+    first, then least recently used ones while any size limit is exceeded.
+
+    With a disk cache, results missing from memory are looked up on disk
+    before calling the function, and found results are promoted into memory.
+    Calculated results are stored in both tiers. The disk tier is best-effort:
+    its errors are logged, and the call proceeds as if it was missing.
+
+    In thread-safe mode the cache is guarded by a lock, and concurrent calls
+    with the same arguments are deduplicated: the first caller computes the
+    result while the others wait for it. If the computation raises, every
+    waiting caller gets the same exception and nothing is cached.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        max_cache_size: int,
+        verbose: bool,
+        thread_safe: bool = False,
+        policies: Sequence[EvictionPolicy] = (),
+        disk_cache: Optional[DiskCache] = None,
+        namespace: Optional[str] = None,
+        key: Union[str, Callable[..., Hashable]] = "args",
+    ) -> None:
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.make_key = _key_builder(key)
+        self.max_cache_size = max_cache_size
+        self.verbose = verbose
+        self.policies: List[EvictionPolicy] = list(policies)
+        if max_cache_size > 0:
+            self.policies.append(MaxEntries(max_cache_size))
+        self.cache: OrderedDict[CacheKey, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_cache = disk_cache
+        self.namespace = ""
+        if disk_cache is not None:
+            self.namespace = _disk_namespace(func, namespace)
+        self.lock = threading.Lock() if thread_safe else None
+        self.in_flight: Dict[CacheKey, _Flight] = {}
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        # Bind like a plain function, so that decorated methods receive self
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # Create a cache key based on args and kwargs
+        key = self.make_key(args, kwargs)
+        if self.lock is not None:
+            return self._call_single_flight(key, args, kwargs)
+
+        result = self._lookup(key)
+        if result is not _MISSING:
+            return result
+
+        result, from_disk = self._compute(key, args, kwargs)
+        self.disk_hits += from_disk
+        self._store(key, result)
+        return result
+
+    def _call_single_flight(
+        self, key: CacheKey, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Calls the function so that each key is computed by one thread at a time."""
+        assert self.lock is not None
+        with self.lock:
+            result = self._lookup(key)
+            if result is not _MISSING:
+                return result
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self.in_flight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            result, from_disk = self._compute(key, args, kwargs)
+            with self.lock:
+                self.disk_hits += from_disk
+                self._store(key, result)
+            flight.result = result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            # Waiters must be released even if caching the result failed
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
+        return result
+
+    def _compute(
+        self, key: CacheKey, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Tuple[Any, bool]:
+        """
+        Obtains a result missing from memory, from disk or by calling the function.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was found on disk.
+        """
+        found, result = self._disk_get(key)
+        if found:
+            return result, True
+
+        if self.verbose:
+            print("Calculating new result...")
+        result = self.func(*args, **kwargs)
+        self._disk_set(key, result)
+        return result, False
+
+    def _disk_get(self, key: CacheKey) -> Tuple[bool, Any]:
+        """Looks a result up in the disk cache, treating its errors as a miss."""
+        if self.disk_cache is None:
+            return False, None
+        try:
+            found, result = self.disk_cache.get(self.namespace, key)
+        except Exception:
+            logger.warning("Disk cache lookup failed", exc_info=True)
+            return False, None
+        if found and self.verbose:
+            print("Retrieving result from disk cache...")
+        return found, result
+
+    def _disk_set(self, key: CacheKey, result: Any) -> None:
+        """Stores a result in the disk cache, logging its errors."""
+        if self.disk_cache is None:
+            return
+        try:
+            self.disk_cache.set(self.namespace, key, result)
+        except Exception:
+            logger.warning("Disk cache store failed", exc_info=True)
+
+    def _guard(self) -> ContextManager[Any]:
+        """Returns the cache lock, or a no-op context if the cache is not shared."""
+        return self.lock if self.lock is not None else contextlib.nullcontext()
+
+    def _lookup(self, key: CacheKey) -> Any:
+        """Returns the cached result for a key, or _MISSING, updating statistics."""
+        cache = self.cache
+        result = cache.get(key, _MISSING)
+        if result is not _MISSING and any(p.expired(key) for p in self.policies):
+            self._remove(key)
+            result = _MISSING
+
+        if result is not _MISSING:
+            cache.move_to_end(key)  # Mark as the most recently used
+            self.hits += 1
+            if self.verbose:
+                print("Retrieving result from cache...")
+        else:
+            self.misses += 1
+        return result
+
+    def _store(self, key: CacheKey, result: Any) -> None:
+        """Caches a result in memory, evicting entries as the policies require."""
+        if not all(policy.admits(result) for policy in self.policies):
+            return
+
+        cache = self.cache
+        if key in cache:
+            self._remove(key)
+        cache[key] = result
+        for policy in self.policies:
+            policy.added(key, result)
+
+        for policy in self.policies:
+            for expired in list(policy.expired_keys()):
+                if expired in cache:
+                    self._remove(expired)
+
+        # Maintain cache size
+        while cache and any(policy.over_limit() for policy in self.policies):
+            self._remove(next(iter(cache)))  # Remove the least recently used item
+
+    def _remove(self, key: CacheKey) -> None:
+        """Drops a cached entry."""
+        del self.cache[key]
+        self.evictions += 1
+        for policy in self.policies:
+            policy.removed(key)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the cache statistics.
+
+        Returns:
+            CacheInfo: Hits, misses and evictions since the last cache_clear,
+            the configured maximum size, the current number of entries in
+            memory and the number of misses served from the disk cache.
+        """
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.max_cache_size,
+            len(self.cache),
+            self.disk_hits,
+        )
+
+    def cache_clear(self) -> None:
+        """Removes all cached results, also from disk, and resets the statistics."""
+        if self.lock is not None:
+            with self.lock:
+                self._clear()
+        else:
+            self._clear()
+
+    def _clear(self) -> None:
+        self.cache.clear()
+        for policy in self.policies:
+            policy.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear(self.namespace)
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+
+class AsyncCachedFunction(CachedFunction):
+    """
+    A coroutine function wrapped by cache_result.
+
+    Awaited results are cached, never the coroutine objects. Concurrent
+    calls with the same arguments in one event loop share a single task:
+    the function runs once and every caller awaits its result or exception.
+    Cancelling one caller does not disturb the others; the shared task is
+    cancelled only when every caller waiting for it has been cancelled, and
+    a cancelled computation is not cached.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.tasks: Dict[CacheKey, "asyncio.Task[Any]"] = {}
+        self.waiters: Dict["asyncio.Task[Any]", int] = {}
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = self.make_key(args, kwargs)
+        with self._guard():
+            result = self._lookup(key)
+        if result is not _MISSING:
+            return result
+
+        task = self.tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._compute_async(key, args, kwargs))
+            self.tasks[key] = task
+            self.waiters[task] = 0
+            task.add_done_callback(functools.partial(self._forget, key))
+
+        self.waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():  # This caller was cancelled, not the computation
+                self.waiters[task] -= 1
+                if not self.waiters[task]:
+                    task.cancel()  # Nobody is waiting for the result any more
+                    # Callers arriving before the task ends start a new one
+                    if self.tasks.get(key) is task:
+                        del self.tasks[key]
+            raise
+
+    async def _compute_async(
+        self, key: CacheKey, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        Obtains a result from disk or by awaiting the function, and caches it.
+
+        The disk cache is blocking, so it is used from the default executor
+        of the loop instead of the loop itself.
+        """
+        found, result = False, None
+        if self.disk_cache is not None:
+            loop = asyncio.get_running_loop()
+            found, result = await loop.run_in_executor(None, self._disk_get, key)
+        if not found:
+            if self.verbose:
+                print("Calculating new result...")
+            result = await self.func(*args, **kwargs)
+            if self.disk_cache is not None:
+                await loop.run_in_executor(None, self._disk_set, key, result)
+        with self._guard():
+            self.disk_hits += found
+            self._store(key, result)
+        return result
+
+    def _forget(self, key: CacheKey, task: "asyncio.Task[Any]") -> None:
+        """Removes a finished task, so that later calls start a new one."""
+        del self.waiters[task]
+        if self.tasks.get(key) is task:
+            del self.tasks[key]
+        if not task.cancelled():
+            task.exception()  # Mark the exception as retrieved
 
 
 def cache_result(
     max_cache_size: int = 0,
     verbose: bool = False,
-) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    thread_safe: bool = False,
+    ttl: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    size_of: Callable[[Any], int] = estimate_size,
+    policies: Sequence[EvictionPolicy] = (),
+    disk_cache: Optional[DiskCache] = None,
+    namespace: Optional[str] = None,
+    key: Union[str, Callable[..., Hashable]] = "args",
+) -> Callable[[Callable[..., Any]], CachedFunction]:
     """
     A decorator for caching the results of a function based on its arguments.
 
     This decorator stores the results of function calls in an ordered cache.
     If the same arguments are passed to the function again, the cached result
     will be returned instead of recalculating it. The cache can be configured
-    to hold a limited number of results. When the cache exceeds this limit,
-    the oldest result will be removed.
+    to hold a limited number of results, to limit their total estimated
+    size and to expire them after a time. When the cache exceeds a limit,
+    the least recently used results will be removed. Coroutine functions
+    are supported: their awaited results are cached.
 
     Args:
         max_cache_size (int): The maximum number of cached results to keep.
-                               If set to 0, caching is disabled.
+                               If set to 0, the cache size is not limited.
         verbose (bool): If True, prints messages indicating whether a result
                         was retrieved from the cache or calculated anew.
+        thread_safe (bool): If True, the cache may be used from several threads,
+                            and concurrent calls with the same arguments run
+                            the function only once.
+        ttl (Optional[float]): If set, results expire this many seconds after
+                               they were calculated.
+        max_bytes (Optional[int]): If set, limits the total estimated size of
+                                   cached results. Larger results are not cached.
+        size_of (Callable[[Any], int]): Estimates the size of a result in bytes
+                                        for max_bytes.
+        policies (Sequence[EvictionPolicy]): Additional eviction policies. They
+                                             are combined with the limits above.
+        disk_cache (Optional[DiskCache]): A persistent second tier behind the
+                                          in-memory cache. It survives restarts
+                                          and may be shared between processes.
+        namespace (Optional[str]): The name under which results are stored in
+                                   the disk cache. Defaults to the qualified
+                                   name of the function; change it, e.g. by
+                                   adding a version, when the function changes.
+        key (Union[str, Callable[..., Hashable]]): How cache keys are built from
+            the call arguments: "args" uses the arguments themselves, which
+            must be hashable; "content" fingerprints their contents, so lists,
+            dicts, arrays and matrices can be passed; a callable receives the
+            call arguments and returns the key.
 
     Returns:
-        Callable: A wrapper function that caches results of the decorated function.
+        Callable: A decorator producing a CachedFunction, which also offers
+                  cache_info() and cache_clear().
+
+    Raises:
+        ValueError: If a disk cache is used without a namespace for a function
+                    whose qualified name is not unique, such as a nested
+                    function or one defined in a script, or if key names
+                    an unknown key builder.
 
     Example:
         @cache_result(max_cache_size=5, verbose=True)
@@ -31,32 +737,41 @@ def cache_result(
 
         result = slow_function(2)  # This will take time to compute.
         result = slow_function(2)  # This will return the cached result immediately.
+        slow_function.cache_info()  # CacheInfo(hits=1, misses=1, ...)
     """
 
-    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+    def decorator(func: Callable[..., Any]) -> CachedFunction:
+        all_policies = list(policies)
+        if ttl is not None:
+            all_policies.append(TimeToLive(ttl))
+        if max_bytes is not None:
+            all_policies.append(MaxBytes(max_bytes, size_of))
+        cls = (
+            AsyncCachedFunction if inspect.iscoroutinefunction(func) else CachedFunction
+        )
+        return cls(
+            func,
+            max_cache_size,
+            verbose,
+            thread_safe,
+            all_policies,
+            disk_cache,
+            namespace,
+            key,
+        )
 
-        cache: OrderedDict[Tuple[Any, frozenset], Any] = OrderedDict()
-
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Create a cache key based on args and kwargs
-            key = (args, frozenset(kwargs.items()))
-            if key in cache:
-                if verbose:
-                    print("Retrieving result from cache...")
-                return cache[key]
-
-            result = func(*args, **kwargs)
-            cache[key] = result
-
-            # Maintain cache size
-            if max_cache_size > 0 and len(cache) > max_cache_size:
-                cache.popitem(last=False)  # Remove the oldest item
-
-            if verbose:
-                print("Calculating new result...")
-
-            return result
+    return decorator
 
-        return wrapper
 
-    return decorator
+def _disk_namespace(func: Callable[..., Any], namespace: Optional[str]) -> str:
+    """Returns the disk cache namespace of a function, refusing ambiguous names."""
+    if namespace is not None:
+        return namespace
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", "<unknown>")
+    if module in (None, "__main__") or "<" in qualname:
+        raise ValueError(
+            f"Cannot derive a unique disk cache namespace for {module}.{qualname}; "
+            "pass namespace explicitly."
+        )
+    return f"{module}.{qualname}"
@@ -0,0 +1,323 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Results are kept in one SQLite table shared by every function using the
+# file; each function stores its entries under its own namespace. SQLite locks
+# the file, so several processes on one host may use the same cache, and the
+# write-ahead log lets them read while another one writes. The total size of
+# the stored results is kept in the meta table, so that it never has to be
+# recomputed over the whole table.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed, size);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('total_size', 0);
+"""
+
+# Access times of hits are written in batches of this many entries, so that
+# reading a result does not take the write lock every time.
+ACCESS_BATCH_SIZE = 64
+
+
+def _canonical(obj: Any) -> Any:
+    """Replaces sets in a key by sorted tuples, so that it pickles the same way
+    in every process regardless of hash randomization."""
+    if isinstance(obj, (set, frozenset)):
+        items = [_canonical(item) for item in obj]
+        try:
+            return ("set", tuple(sorted(items)))
+        except TypeError:
+            return ("set", tuple(sorted(items, key=repr)))
+    if isinstance(obj, tuple):
+        return tuple(_canonical(item) for item in obj)
+    if isinstance(obj, list):
+        return [_canonical(item) for item in obj]
+    return obj
+
+
+def hash_key(key: Any) -> str:
+    """
+    Turns a cache key into a digest that is stable across processes.
+
+    Args:
+        key (Any): A picklable cache key.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the pickled key.
+    """
+    data = pickle.dumps(_canonical(key), protocol=4)
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    """
+    A persistent cache of function results, kept in an SQLite database.
+
+    Entries are evicted in least recently used order once their total
+    serialized size exceeds max_bytes. Access times of hits are recorded in
+    batches, so the order is approximate for the most recent hits.
+
+    The cache may be used from several threads and processes at once; every
+    thread opens its own connection. SQLite connections must not cross a
+    fork: a cache used in a process has to be closed before that process
+    forks, otherwise the child gets a RuntimeError when it uses the cache.
+
+    Args:
+        path (str): The database file. It is created if missing.
+        max_bytes (Optional[int]): The limit for the total size of stored
+                                   results. If None, the size is not limited.
+        key_hash (Callable[[Any], str]): Turns a cache key into a string that
+                                         is equal in every process for equal keys.
+        serialize (Callable[[Any], bytes]): Turns a result into bytes.
+        deserialize (Callable[[bytes], Any]): Restores a result from bytes.
+        timeout (float): Seconds to wait for a lock held by another process.
+
+    Raises:
+        ValueError: If max_bytes is not positive.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        key_hash: Callable[[Any], str] = hash_key,
+        serialize: Callable[[Any], bytes] = pickle.dumps,
+        deserialize: Callable[[bytes], Any] = pickle.loads,
+        timeout: float = 30.0,
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Disk cache size must be positive.")
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.key_hash = key_hash
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._owner_pid: Optional[int] = None
+        self._accessed: Dict[Tuple[str, str], float] = {}
+
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread, opening it if needed.
+
+        Raises:
+            RuntimeError: If the cache was opened in a parent process and not
+                          closed before the fork.
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._owner_pid not in (None, pid):
+                raise RuntimeError(
+                    "DiskCache was used before the process forked; "
+                    "close it before forking."
+                )
+            connection: Optional[sqlite3.Connection]
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._connect()
+                connection.execute("PRAGMA synchronous=NORMAL")
+                self._connections.append(connection)
+                self._local.connection = connection
+                self._owner_pid = pid
+        return connection
+
+    def close(self) -> None:
+        """
+        Writes pending access times and closes the connections of all threads.
+
+        The cache may be used again afterwards, also in a forked child process.
+        """
+        if self._owner_pid == os.getpid() and self._accessed:
+            with self._transaction() as connection:
+                self._flush_accessed(connection)
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                for connection in self._connections:
+                    connection.close()
+            self._connections.clear()
+            self._accessed.clear()
+            self._local = threading.local()
+            self._owner_pid = None
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection())
+
+    def get(self, namespace: str, key: Any) -> Tuple[bool, Any]:
+        """
+        Looks up a stored result and marks it as the most recently used.
+
+        Args:
+            namespace (str): The namespace of the calling function.
+            key (Any): The cache key.
+
+        Returns:
+            Tuple[bool, Any]: Whether the result was found, and the result.
+        """
+        digest = self.key_hash(key)
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, digest),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return False, None
+
+        with self._lock:
+            self._accessed[(namespace, digest)] = time.time()
+            flush = len(self._accessed) >= ACCESS_BATCH_SIZE
+        if flush:
+            with self._transaction() as connection:
+                self._flush_accessed(connection)
+        return True, self.deserialize(row[0])
+
+    def _flush_accessed(self, connection: sqlite3.Connection) -> None:
+        """Writes the access times recorded since the last flush."""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        connection.executemany(
+            "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+            [(at, namespace, key) for (namespace, key), at in accessed.items()],
+        )
+
+    def set(self, namespace: str, key: Any, result: Any) -> None:
+        """
+        Stores a result, evicting least recently used entries if needed.
+
+        A result larger than max_bytes is not stored.
+
+        Args:
+            namespace (str): The namespace of the calling function.
+            key (Any): The cache key.
+            result (Any): The result to store.
+        """
+        value = self.serialize(result)
+        size = len(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        digest = self.key_hash(key)
+        with self._transaction() as connection:
+            self._flush_accessed(connection)
+            row = connection.execute(
+                "SELECT size FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, digest),
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (namespace, digest, value, size, time.time()),
+            )
+            total = self._add_to_total(connection, size - (row[0] if row else 0))
+            if self.max_bytes is not None and total > self.max_bytes:
+                self._evict(connection, total - self.max_bytes)
+
+    @staticmethod
+    def _add_to_total(connection: sqlite3.Connection, delta: int) -> int:
+        """Updates the stored total size and returns the new total."""
+        connection.execute(
+            "UPDATE meta SET value = value + ? WHERE name = 'total_size'", (delta,)
+        )
+        (total,) = connection.execute(
+            "SELECT value FROM meta WHERE name = 'total_size'"
+        ).fetchone()
+        return total
+
+    @classmethod
+    def _evict(cls, connection: sqlite3.Connection, excess: int) -> None:
+        """Deletes least recently used entries of at least the given total size."""
+        rows = connection.execute(
+            "SELECT rowid, size FROM entries ORDER BY accessed, rowid"
+        )
+        doomed = []
+        freed = 0
+        for rowid, size in rows:
+            doomed.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM entries WHERE rowid = ?", doomed)
+        cls._add_to_total(connection, -freed)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Removes stored results.
+
+        Args:
+            namespace (Optional[str]): If set, only the results of this
+                                       namespace are removed.
+        """
+        with self._transaction() as connection:
+            self._flush_accessed(connection)
+            if namespace is None:
+                connection.execute("DELETE FROM entries")
+                connection.execute(
+                    "UPDATE meta SET value = 0 WHERE name = 'total_size'"
+                )
+            else:
+                (freed,) = connection.execute(
+                    "SELECT TOTAL(size) FROM entries WHERE namespace = ?",
+                    (namespace,),
+                ).fetchone()
+                connection.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+                self._add_to_total(connection, -int(freed))
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def total_size(self) -> int:
+        """Returns the total serialized size of the stored results."""
+        (total,) = (
+            self._connection()
+            .execute("SELECT value FROM meta WHERE name = 'total_size'")
+            .fetchone()
+        )
+        return total
+
+
+class _Transaction:
+    """Runs statements in a transaction that takes the write lock up front."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
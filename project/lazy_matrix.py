@@ -0,0 +1,239 @@
+from abc import ABC, abstractmethod
+from operator import mul
+from typing import List, Sequence, Tuple, Union
+
+from project.matrix_operation import Matrix, MatrixLike, Shape
+
+
+class Expression(ABC):
+    """A node of a lazily evaluated matrix expression.
+
+    ``+``, ``@`` and ``.T`` build a graph instead of computing anything.
+    The graph is evaluated once by ``evaluate``, which fuses transposes of
+    stored matrices into index mapping and adds the other terms of a sum to
+    a product while its rows are produced, so neither transposed copies nor
+    the unsummed product are ever materialized.
+    """
+
+    __slots__ = ("shape",)
+
+    def __init__(self, shape: Shape) -> None:
+        self.shape = shape
+
+    def __add__(self, other: "Operand") -> "Expression":
+        return Sum(self, _wrap(other))
+
+    def __radd__(self, other: "Operand") -> "Expression":
+        return Sum(_wrap(other), self)
+
+    def __matmul__(self, other: "Operand") -> "Expression":
+        return Product(self, _wrap(other))
+
+    def __rmatmul__(self, other: "Operand") -> "Expression":
+        return Product(_wrap(other), self)
+
+    @property
+    def T(self) -> "Expression":
+        """The transposed expression."""
+        return Transpose(self)
+
+    @abstractmethod
+    def evaluate(self) -> List[List[float]]:
+        """Evaluates the expression.
+
+        Returns:
+            List[List[float]]: The resulting matrix.
+        """
+
+
+Operand = Union[Expression, MatrixLike]
+
+
+class Leaf(Expression):
+    """A stored matrix."""
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: MatrixLike) -> None:
+        if isinstance(matrix, Matrix):
+            shape = matrix.shape
+        else:
+            shape = (len(matrix), len(matrix[0]) if matrix else 0)
+        super().__init__(shape)
+        self.matrix = matrix
+
+    def row(self, i: int) -> Sequence[float]:
+        """Returns the i-th row of the stored matrix."""
+        if isinstance(self.matrix, Matrix):
+            return self.matrix.row(i)
+        return self.matrix[i]
+
+    def column(self, j: int) -> Sequence[float]:
+        """Returns the j-th column of the stored matrix."""
+        if isinstance(self.matrix, Matrix):
+            return self.matrix.T.row(j)
+        return [row[j] for row in self.matrix]
+
+    def evaluate(self) -> List[List[float]]:
+        return [list(self.row(i)) for i in range(self.shape[0])]
+
+
+class Transpose(Expression):
+    """The transpose of an expression."""
+
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: Expression) -> None:
+        super().__init__((operand.shape[1], operand.shape[0]))
+        self.operand = operand
+
+    @property
+    def T(self) -> Expression:
+        return self.operand
+
+    def evaluate(self) -> List[List[float]]:
+        source = _source(self)
+        return [list(source.row(i)) for i in range(self.shape[0])]
+
+
+class Sum(Expression):
+    """The sum of two expressions of the same shape."""
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Expression, right: Expression) -> None:
+        if not left.shape[0] or not left.shape[1] or left.shape != right.shape:
+            raise ValueError("Matrices must be of the same dimensions and non-empty")
+        super().__init__(left.shape)
+        self.left = left
+        self.right = right
+
+    def terms(self) -> List[Expression]:
+        """Returns the summands of this and directly nested sums, in order."""
+        terms: List[Expression] = []
+        for operand in (self.left, self.right):
+            if isinstance(operand, Sum):
+                terms.extend(operand.terms())
+            else:
+                terms.append(operand)
+        return terms
+
+    def evaluate(self) -> List[List[float]]:
+        terms = self.terms()
+        for index, term in enumerate(terms):
+            if isinstance(term, Product):
+                addends = terms[:index] + terms[index + 1 :]
+                return _evaluate_product(term, [_source(t) for t in addends])
+
+        sources = [_source(term) for term in terms]
+        result = []
+        for i in range(self.shape[0]):
+            row = list(sources[0].row(i))
+            for source in sources[1:]:
+                row = [acc + value for acc, value in zip(row, source.row(i))]
+            result.append(row)
+        return result
+
+
+class Product(Expression):
+    """The matrix product of two expressions."""
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Expression, right: Expression) -> None:
+        if not left.shape[0] or not right.shape[0]:
+            raise ValueError("Matrices cannot be empty.")
+        if left.shape[1] != right.shape[0]:
+            raise ValueError("Incompatible matrices for multiplication.")
+        super().__init__((left.shape[0], right.shape[1]))
+        self.left = left
+        self.right = right
+
+    def evaluate(self) -> List[List[float]]:
+        return _evaluate_product(self, [])
+
+
+class _Source:
+    """Row access to a stored matrix, with an optional fused transpose."""
+
+    __slots__ = ("leaf", "transposed")
+
+    def __init__(self, leaf: Leaf, transposed: bool) -> None:
+        self.leaf = leaf
+        self.transposed = transposed
+
+    def row(self, i: int) -> Sequence[float]:
+        """Returns the i-th row of the (possibly transposed) matrix."""
+        return self.leaf.column(i) if self.transposed else self.leaf.row(i)
+
+
+def _source(expression: Expression) -> _Source:
+    """Returns row access to an expression without copying stored matrices.
+
+    Transposes of stored matrices are read through index mapping. Any other
+    expression is evaluated first.
+    """
+    transposed = False
+    while isinstance(expression, Transpose):
+        expression = expression.operand
+        transposed = not transposed
+    if not isinstance(expression, Leaf):
+        expression = Leaf(expression.evaluate())
+    return _Source(expression, transposed)
+
+
+def _evaluate_product(
+    product: Product, addends: Sequence[_Source]
+) -> List[List[float]]:
+    """Evaluates a product and adds the given matrices to its rows.
+
+    If the right operand is a transposed stored matrix, each element is a
+    dot product of two stored rows. Otherwise rows of the right operand are
+    streamed in i-k-j order as in multiply_matrices. The addends are applied
+    to each row of the product as soon as it is computed.
+    """
+    left = _source(product.left)
+    right = _source(product.right)
+    rows, inner = product.left.shape
+    columns = product.shape[1]
+
+    if right.transposed:
+        stored = [right.leaf.row(j) for j in range(columns)]
+    else:
+        rows2 = [right.row(k) for k in range(inner)]
+
+    result = []
+    for i in range(rows):
+        row1 = left.row(i)
+        if right.transposed:
+            row = [sum(map(mul, row1, column)) for column in stored]
+        else:
+            row = [0.0] * columns
+            for value, row2 in zip(row1, rows2):
+                row = [acc + value * other for acc, other in zip(row, row2)]
+        for addend in addends:
+            row = [acc + value for acc, value in zip(row, addend.row(i))]
+        result.append(row)
+    return result
+
+
+def _wrap(operand: Operand) -> Expression:
+    """Wraps a stored matrix into an expression node."""
+    if isinstance(operand, Expression):
+        return operand
+    return Leaf(operand)
+
+
+def lazy(matrix: MatrixLike) -> Expression:
+    """Starts a lazy expression from a stored matrix.
+
+    Args:
+        matrix (MatrixLike): The matrix, as a list of rows or a Matrix.
+
+    Returns:
+        Expression: The expression node for the matrix.
+
+    Example:
+        result = (lazy(a) @ lazy(b).T + c).evaluate()
+    """
+    return Leaf(matrix)
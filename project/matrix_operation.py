@@ -1,29 +1,448 @@
-from typing import List
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from operator import add
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 
+Buffer = Union["array[float]", "memoryview[float]"]
+
+
+class Matrix:
+    """A dense matrix of floats stored in one contiguous buffer.
+
+    Elements live in a flat ``array('d')``, or in a float64 ``memoryview``
+    such as one over a memory-mapped file, and are addressed through a shape
+    and a pair of strides, so element (i, j) is stored at
+    ``data[offset + i * strides[0] + j * strides[1]]``. Several matrices may
+    share one buffer: ``transpose`` returns such a view instead of a copy,
+    and writes through a view are visible in the original matrix.
+    """
+
+    __slots__ = ("data", "shape", "strides", "offset")
+
+    def __init__(
+        self,
+        data: Buffer,
+        shape: Tuple[int, int],
+        strides: Optional[Tuple[int, int]] = None,
+        offset: int = 0,
+    ) -> None:
+        """
+        Initializes a matrix over an existing buffer without copying it.
+
+        Args:
+            data (Buffer): The flat buffer with matrix elements.
+            shape (Tuple[int, int]): The number of rows and columns.
+            strides (Optional[Tuple[int, int]]): Distance in elements between
+                neighbouring rows and columns. Defaults to row-major layout.
+            offset (int): Position of element (0, 0) in the buffer.
+
+        Raises:
+            ValueError: If the buffer is too small for the shape and strides.
+        """
+        rows, columns = shape
+        if strides is None:
+            strides = (columns, 1)
+        if rows and columns:
+            last = offset + (rows - 1) * strides[0] + (columns - 1) * strides[1]
+            if offset < 0 or last >= len(data):
+                raise ValueError("Buffer is too small for the matrix shape.")
+        self.data = data
+        self.shape = shape
+        self.strides = strides
+        self.offset = offset
+
+    @classmethod
+    def from_lists(cls, matrix: Sequence[Sequence[float]]) -> "Matrix":
+        """Creates a row-major matrix from a list of rows.
+
+        Raises:
+            ValueError: If the rows have different lengths.
+        """
+        rows = len(matrix)
+        columns = len(matrix[0]) if rows else 0
+        if any(len(row) != columns for row in matrix):
+            raise ValueError("All rows must have the same length.")
+        return cls(array("d", chain.from_iterable(matrix)), (rows, columns))
+
+    @classmethod
+    def zeros(cls, rows: int, columns: int) -> "Matrix":
+        """Creates a row-major matrix filled with zeros."""
+        return cls(array("d", bytes(8 * rows * columns)), (rows, columns))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        return self.data[self._position(index)]
+
+    def __setitem__(self, index: Tuple[int, int], value: float) -> None:
+        self.data[self._position(index)] = value
+
+    def __iter__(self) -> Iterator[Sequence[float]]:
+        for i in range(self.shape[0]):
+            yield self.row(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Matrix):
+            return self.shape == other.shape and self.tolist() == other.tolist()
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.tolist()})"
+
+    def _position(self, index: Tuple[int, int]) -> int:
+        i, j = index
+        rows, columns = self.shape
+        if not (0 <= i < rows and 0 <= j < columns):
+            raise IndexError("Matrix index out of range.")
+        return self.offset + i * self.strides[0] + j * self.strides[1]
+
+    def row(self, i: int) -> Sequence[float]:
+        """Returns the i-th row as a flat buffer.
+
+        The row is a copy for an array buffer and a view for a memoryview
+        buffer, such as that of a matrix loaded by binary_format.load_matrix.
+        """
+        start = self.offset + i * self.strides[0]
+        step = self.strides[1]
+        return self.data[start : start + self.shape[1] * step : step]
+
+    def is_contiguous(self) -> bool:
+        """Checks whether the matrix occupies its whole buffer in row-major order."""
+        return (
+            self.offset == 0
+            and self.strides == (self.shape[1], 1)
+            and len(self.data) == self.shape[0] * self.shape[1]
+        )
+
+    @property
+    def T(self) -> "Matrix":
+        """The transposed view of the matrix, sharing its buffer."""
+        return Matrix(
+            self.data,
+            (self.shape[1], self.shape[0]),
+            (self.strides[1], self.strides[0]),
+            self.offset,
+        )
+
+    def transpose(self) -> "Matrix":
+        """Returns the transposed view of the matrix, sharing its buffer."""
+        return self.T
+
+    def copy(self) -> "Matrix":
+        """Returns a row-major copy with its own buffer."""
+        if self.is_contiguous():
+            return Matrix(array("d", self.data), self.shape)
+        return Matrix(array("d", chain.from_iterable(self)), self.shape)
+
+    def tolist(self) -> List[List[float]]:
+        """Converts the matrix to a list of rows."""
+        return [list(row) for row in self]
+
+
+MatrixLike = Union[List[List[float]], Matrix]
+
+
+class SparseMatrix:
+    """A sparse matrix of floats in compressed sparse row (CSR) format.
+
+    The nonzero values of row i are ``values[indptr[i]:indptr[i + 1]]``, and
+    their column numbers are stored at the same positions of ``indices`` in
+    ascending order. Memory use and the cost of every operation scale with
+    the number of nonzeros instead of with the full shape.
+    """
+
+    __slots__ = ("shape", "indptr", "indices", "values")
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        indptr: "array[int]",
+        indices: "array[int]",
+        values: "array[float]",
+    ) -> None:
+        """
+        Initializes a matrix over existing CSR arrays without copying them.
+
+        Args:
+            shape (Tuple[int, int]): The number of rows and columns.
+            indptr (array[int]): Start of every row in indices and values,
+                followed by the number of nonzeros.
+            indices (array[int]): Column numbers of the nonzero values.
+            values (array[float]): The nonzero values.
+
+        Raises:
+            ValueError: If the arrays do not describe a matrix of this shape.
+        """
+        if (
+            len(indptr) != shape[0] + 1
+            or len(indices) != len(values)
+            or indptr[-1] != len(values)
+        ):
+            raise ValueError("CSR arrays do not match the matrix shape.")
+        self.shape = shape
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+
+    @classmethod
+    def from_coo(
+        cls,
+        shape: Tuple[int, int],
+        rows: Sequence[int],
+        columns: Sequence[int],
+        values: Sequence[float],
+    ) -> "SparseMatrix":
+        """Creates a matrix from coordinate (COO) triplets.
+
+        Values with the same coordinates are summed, and zero sums are dropped.
+
+        Raises:
+            ValueError: If the triplets have different lengths or a coordinate
+                lies outside the shape.
+        """
+        if not len(rows) == len(columns) == len(values):
+            raise ValueError("COO arrays must have the same length.")
+
+        entries: List[Dict[int, float]] = [{} for _ in range(shape[0])]
+        for i, j, value in zip(rows, columns, values):
+            if not (0 <= i < shape[0] and 0 <= j < shape[1]):
+                raise ValueError("COO coordinates are outside the matrix shape.")
+            row = entries[i]
+            row[j] = row.get(j, 0.0) + value
+        return cls._from_row_dicts(shape, entries)
+
+    @classmethod
+    def from_dense(cls, matrix: MatrixLike) -> "SparseMatrix":
+        """Creates a sparse copy of a dense matrix, keeping only nonzeros."""
+        shape = _shape(matrix)
+        indptr = array("q", [0])
+        indices = array("q")
+        values = array("d")
+        for row in _rows(matrix):
+            for j, value in enumerate(row):
+                if value:
+                    indices.append(j)
+                    values.append(value)
+            indptr.append(len(values))
+        return cls(shape, indptr, indices, values)
+
+    @classmethod
+    def _from_row_dicts(
+        cls, shape: Tuple[int, int], rows: Iterable[Dict[int, float]]
+    ) -> "SparseMatrix":
+        """Creates a matrix from per-row mappings of column number to value."""
+        indptr = array("q", [0])
+        indices = array("q")
+        values = array("d")
+        for row in rows:
+            for j in sorted(row):
+                value = row[j]
+                if value:
+                    indices.append(j)
+                    values.append(value)
+            indptr.append(len(values))
+        return cls(shape, indptr, indices, values)
+
+    @property
+    def nnz(self) -> int:
+        """The number of stored nonzero values."""
+        return len(self.values)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        if not (0 <= i < self.shape[0] and 0 <= j < self.shape[1]):
+            raise IndexError("Matrix index out of range.")
+        end = self.indptr[i + 1]
+        position = bisect_left(self.indices, j, self.indptr[i], end)
+        if position < end and self.indices[position] == j:
+            return self.values[position]
+        return 0.0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SparseMatrix):
+            return (
+                self.shape == other.shape
+                and self.indptr == other.indptr
+                and self.indices == other.indices
+                and self.values == other.values
+            )
+        if isinstance(other, Matrix):
+            return self.shape == other.shape and self.to_dense() == other.tolist()
+        if isinstance(other, list):
+            return self.to_dense() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SparseMatrix(shape={self.shape}, nnz={self.nnz})"
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        """Iterates over (column, value) pairs of the nonzeros in the i-th row."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[start:end], self.values[start:end])
+
+    def to_coo(self) -> Tuple[List[int], List[int], List[float]]:
+        """Converts the matrix to row, column and value lists of its nonzeros."""
+        rows = [i for i in range(self.shape[0]) for _ in self.row_items(i)]
+        return rows, self.indices.tolist(), self.values.tolist()
+
+    def to_dense(self) -> List[List[float]]:
+        """Converts the matrix to a list of rows."""
+        result = []
+        for i in range(self.shape[0]):
+            row = [0.0] * self.shape[1]
+            for j, value in self.row_items(i):
+                row[j] = value
+            result.append(row)
+        return result
+
+    @property
+    def T(self) -> "SparseMatrix":
+        """The transposed matrix, built in O(nnz) time."""
+        rows, columns = self.shape
+        indptr = array("q", bytes(8 * (columns + 1)))
+        for j in self.indices:
+            indptr[j + 1] += 1
+        for j in range(columns):
+            indptr[j + 1] += indptr[j]
+
+        positions = array("q", indptr[:-1])
+        indices = array("q", bytes(8 * self.nnz))
+        values = array("d", bytes(8 * self.nnz))
+        for i in range(rows):
+            for j, value in self.row_items(i):
+                position = positions[j]
+                indices[position] = i
+                values[position] = value
+                positions[j] = position + 1
+        return SparseMatrix((columns, rows), indptr, indices, values)
+
+    def transpose(self) -> "SparseMatrix":
+        """Returns the transposed matrix."""
+        return self.T
+
+
+AnyMatrix = Union[MatrixLike, SparseMatrix]
+Shape = Tuple[int, int]
+
+
+def _shape(matrix: AnyMatrix) -> Shape:
+    """Returns the number of rows and columns of any matrix representation."""
+    if isinstance(matrix, (Matrix, SparseMatrix)):
+        return matrix.shape
+    return len(matrix), len(matrix[0]) if matrix else 0
+
+
+def _check_product_shapes(shape1: Shape, shape2: Shape) -> Tuple[int, int, int]:
+    """Validates the shapes of the operands of a matrix product.
+
+    Returns:
+        Tuple[int, int, int]: The number of rows, the inner dimension and the
+        number of columns of the product.
+
+    Raises:
+        ValueError: If either matrix is empty or if they are incompatible for multiplication.
+    """
+    rows, inner = shape1
+    inner2, columns = shape2
+
+    # Check if either matrix is empty
+    if not rows or not inner2:
+        raise ValueError("Matrices cannot be empty.")
+
+    # Check for compatibility of matrices for multiplication
+    if inner != inner2:
+        raise ValueError("Incompatible matrices for multiplication.")
+    return rows, inner, columns
+
+
+def _rows(matrix: MatrixLike) -> Sequence[Sequence[float]]:
+    """Returns the rows of either matrix representation."""
+    if isinstance(matrix, Matrix):
+        return list(matrix)
+    return matrix
+
+
+@overload
 def add_matrices(
     matrix1: List[List[float]], matrix2: List[List[float]]
 ) -> List[List[float]]:
+    ...
+
+
+@overload
+def add_matrices(matrix1: SparseMatrix, matrix2: SparseMatrix) -> SparseMatrix:
+    ...
+
+
+@overload
+def add_matrices(matrix1: MatrixLike, matrix2: MatrixLike) -> MatrixLike:
+    ...
+
+
+@overload
+def add_matrices(matrix1: AnyMatrix, matrix2: AnyMatrix) -> AnyMatrix:
+    ...
+
+
+def add_matrices(matrix1: AnyMatrix, matrix2: AnyMatrix) -> AnyMatrix:
     """Adds two matrices of the same size.
 
+    If either operand is a Matrix, the result is a Matrix as well. The sum of
+    two sparse matrices is sparse; the sum of a sparse and a dense matrix has
+    the representation of the dense operand.
+
     Args:
-        matrix1 (List[List[float]]): The first matrix.
-        matrix2 (List[List[float]]): The second matrix.
+        matrix1 (AnyMatrix): The first matrix.
+        matrix2 (AnyMatrix): The second matrix.
 
     Raises:
         ValueError: If the matrices have different sizes or are empty.
 
     Returns:
-        List[List[float]]: The resulting matrix, which is the sum of matrix1 and matrix2.
+        AnyMatrix: The resulting matrix, which is the sum of matrix1 and matrix2.
     """
-    if (
-        not matrix1
-        or not matrix2
-        or len(matrix1) != len(matrix2)
-        or len(matrix1[0]) != len(matrix2[0])
-    ):
+    shape = _shape(matrix1)
+    if not shape[0] or not shape[1] or shape != _shape(matrix2):
         raise ValueError("Matrices must be of the same dimensions and non-empty")
 
+    if isinstance(matrix1, SparseMatrix) or isinstance(matrix2, SparseMatrix):
+        return _add_sparse(matrix1, matrix2)
+
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        if (
+            isinstance(matrix1, Matrix)
+            and isinstance(matrix2, Matrix)
+            and matrix1.is_contiguous()
+            and matrix2.is_contiguous()
+        ):
+            return Matrix(array("d", map(add, matrix1.data, matrix2.data)), shape)
+        rows = zip(_rows(matrix1), _rows(matrix2))
+        return Matrix(
+            array("d", chain.from_iterable(map(add, a, b) for a, b in rows)), shape
+        )
+
     result = []
     for i in range(len(matrix1)):
         row = []
@@ -33,59 +452,651 @@ def add_matrices(
     return result
 
 
-from typing import List
+@overload
+def multiply_matrices(
+    matrix1: List[List[float]],
+    matrix2: List[List[float]],
+    block_size: Optional[int] = None,
+) -> List[List[float]]:
+    ...
 
 
+@overload
 def multiply_matrices(
-    matrix1: List[List[float]], matrix2: List[List[float]]
-) -> List[List[float]]:
+    matrix1: SparseMatrix,
+    matrix2: SparseMatrix,
+    block_size: Optional[int] = None,
+) -> SparseMatrix:
+    ...
+
+
+@overload
+def multiply_matrices(
+    matrix1: MatrixLike, matrix2: MatrixLike, block_size: Optional[int] = None
+) -> MatrixLike:
+    ...
+
+
+@overload
+def multiply_matrices(
+    matrix1: AnyMatrix, matrix2: AnyMatrix, block_size: Optional[int] = None
+) -> AnyMatrix:
+    ...
+
+
+def multiply_matrices(
+    matrix1: AnyMatrix, matrix2: AnyMatrix, block_size: Optional[int] = None
+) -> AnyMatrix:
     """Multiplies two matrices.
 
+    Rows of matrix2 are streamed in i-k-j order, so the inner loop walks
+    contiguous rows instead of columns. Optionally the product is split into
+    square tiles of ``block_size`` to keep the working set small; in pure
+    Python the slicing overhead roughly cancels the cache benefit, so tiling
+    is off by default. For every element the products are summed in the same
+    (ascending k) order as the textbook algorithm, so the result does not
+    depend on the chosen kernel. If either operand is a Matrix, the result is
+    a Matrix.
+
+    Sparse operands are multiplied by sparse kernels whose cost depends on
+    the number of nonzeros; block_size does not apply to them. The product of
+    two sparse matrices is sparse; the product of a sparse and a dense matrix
+    has the representation of the dense operand.
+
     Args:
-        matrix1 (List[List[float]]): The first matrix to be multiplied.
-        matrix2 (List[List[float]]): The second matrix to be multiplied.
+        matrix1 (AnyMatrix): The first matrix to be multiplied.
+        matrix2 (AnyMatrix): The second matrix to be multiplied.
+        block_size (Optional[int]): Tile size for the blocked kernel. If None
+            or zero, the row-streaming kernel is used.
 
     Raises:
         ValueError: If either matrix is empty or if they are incompatible for multiplication.
 
     Returns:
-        List[List[float]]: The resulting matrix, which is the product of matrix1 and matrix2.
+        AnyMatrix: The resulting matrix, which is the product of matrix1 and matrix2.
     """
 
-    # Check if either matrix is empty
-    if not matrix1 or not matrix2:
-        raise ValueError("Matrices cannot be empty.")
+    rows, inner, columns = _check_product_shapes(_shape(matrix1), _shape(matrix2))
 
-    # Check for compatibility of matrices for multiplication
-    if len(matrix1[0]) != len(matrix2):
-        raise ValueError("Incompatible matrices for multiplication.")
+    if isinstance(matrix1, SparseMatrix) or isinstance(matrix2, SparseMatrix):
+        return _multiply_sparse(matrix1, matrix2)
 
-    # Initialize the result matrix with zeros
-    result = [[0.0 for _ in range(len(matrix2[0]))] for _ in range(len(matrix1))]
+    if block_size is None:
+        block_size = 0
+    if block_size < 0:
+        raise ValueError("Block size must be non-negative.")
 
-    # Perform matrix multiplication
-    for i in range(len(matrix1)):
-        for j in range(len(matrix2[0])):
-            for k in range(len(matrix2)):
-                result[i][j] += matrix1[i][k] * matrix2[k][j]
+    rows1 = _rows(matrix1)
+    rows2 = _rows(matrix2)
+    if block_size == 0 or block_size >= max(inner, columns):
+        result = _multiply_rows(rows1, rows2)
+    else:
+        result = _multiply_blocked(rows1, rows2, block_size)
 
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        return Matrix(array("d", chain.from_iterable(result)), (rows, columns))
     return result
 
 
+def _dense_result(
+    rows: List[List[float]], like1: AnyMatrix, like2: AnyMatrix
+) -> MatrixLike:
+    """Wraps a dense result into a Matrix if either operand is a Matrix."""
+    if isinstance(like1, Matrix) or isinstance(like2, Matrix):
+        shape = (len(rows), len(rows[0]) if rows else 0)
+        return Matrix(array("d", chain.from_iterable(rows)), shape)
+    return rows
+
+
+def _add_sparse(matrix1: AnyMatrix, matrix2: AnyMatrix) -> AnyMatrix:
+    """Adds two matrices of the same shape, at least one of which is sparse."""
+    if isinstance(matrix1, SparseMatrix) and isinstance(matrix2, SparseMatrix):
+        rows = []
+        for i in range(matrix1.shape[0]):
+            sums = dict(matrix1.row_items(i))
+            for j, value in matrix2.row_items(i):
+                sums[j] = sums.get(j, 0.0) + value
+            rows.append(sums)
+        return SparseMatrix._from_row_dicts(matrix1.shape, rows)
+
+    if isinstance(matrix1, SparseMatrix):
+        assert not isinstance(matrix2, SparseMatrix)
+        result = _add_dense_sparse(matrix2, matrix1)
+    else:
+        assert isinstance(matrix2, SparseMatrix)
+        result = _add_dense_sparse(matrix1, matrix2)
+    return _dense_result(result, matrix1, matrix2)
+
+
+def _add_dense_sparse(dense: MatrixLike, sparse: SparseMatrix) -> List[List[float]]:
+    """Adds a sparse matrix to a dense one of the same shape."""
+    result = []
+    for i, dense_row in enumerate(_rows(dense)):
+        row = [float(value) for value in dense_row]
+        for j, value in sparse.row_items(i):
+            row[j] += value
+        result.append(row)
+    return result
+
+
+def _multiply_sparse(matrix1: AnyMatrix, matrix2: AnyMatrix) -> AnyMatrix:
+    """Multiplies two compatible matrices, at least one of which is sparse."""
+    columns = _shape(matrix2)[1]
+
+    if isinstance(matrix1, SparseMatrix) and isinstance(matrix2, SparseMatrix):
+        # Gustavson's algorithm: row i of the product is a sum of the rows of
+        # matrix2 selected by the nonzeros of row i of matrix1.
+        products = []
+        for i in range(matrix1.shape[0]):
+            sums: Dict[int, float] = {}
+            for k, value in matrix1.row_items(i):
+                for j, other in matrix2.row_items(k):
+                    sums[j] = sums.get(j, 0.0) + value * other
+            products.append(sums)
+        return SparseMatrix._from_row_dicts((matrix1.shape[0], columns), products)
+
+    result = []
+    if isinstance(matrix1, SparseMatrix):
+        assert not isinstance(matrix2, SparseMatrix)
+        rows2 = _rows(matrix2)
+        for i in range(matrix1.shape[0]):
+            dense_row = [0.0] * columns
+            for k, value in matrix1.row_items(i):
+                dense_row = [
+                    acc + value * other for acc, other in zip(dense_row, rows2[k])
+                ]
+            result.append(dense_row)
+    else:
+        assert isinstance(matrix2, SparseMatrix)
+        for row1 in _rows(matrix1):
+            dense_row = [0.0] * columns
+            for k, value in enumerate(row1):
+                if value:
+                    for j, other in matrix2.row_items(k):
+                        dense_row[j] += value * other
+            result.append(dense_row)
+    return _dense_result(result, matrix1, matrix2)
+
+
+def _multiply_rows(
+    matrix1: Sequence[Sequence[float]], matrix2: Sequence[Sequence[float]]
+) -> List[List[float]]:
+    """Row-streaming (i-k-j) multiplication kernel."""
+    columns = len(matrix2[0])
+    result = [[0.0] * columns for _ in matrix1]
+    _accumulate_rows(result, matrix1, matrix2)
+    return result
+
+
+def _accumulate_rows(
+    result: List[List[float]],
+    matrix1: Sequence[Sequence[float]],
+    matrix2: Sequence[Sequence[float]],
+) -> None:
+    """Adds the product of two matrices to the rows of result in place (i-k-j)."""
+    for index, row1 in enumerate(matrix1):
+        row = result[index]
+        for value, row2 in zip(row1, matrix2):
+            row = [acc + value * other for acc, other in zip(row, row2)]
+        result[index] = row
+
+
+def _multiply_blocked(
+    matrix1: Sequence[Sequence[float]],
+    matrix2: Sequence[Sequence[float]],
+    block_size: int,
+) -> List[List[float]]:
+    """Tiled i-k-j multiplication kernel.
+
+    The output is computed one column panel at a time, and each panel of
+    matrix2 is consumed in square tiles. Tiles along k are visited in
+    ascending order, so every element is accumulated in the same order as
+    in the row-streaming kernel.
+    """
+    inner = len(matrix2)
+    columns = len(matrix2[0])
+    result = [[0.0] * columns for _ in range(len(matrix1))]
+
+    for j_start in range(0, columns, block_size):
+        j_end = min(j_start + block_size, columns)
+        panel = [row2[j_start:j_end] for row2 in matrix2]
+
+        for k_start in range(0, inner, block_size):
+            k_end = min(k_start + block_size, inner)
+            tile = panel[k_start:k_end]
+
+            for row1, row in zip(matrix1, result):
+                acc = row[j_start:j_end]
+                for value, row2 in zip(row1[k_start:k_end], tile):
+                    acc = [a + value * other for a, other in zip(acc, row2)]
+                row[j_start:j_end] = acc
+
+    return result
+
+
+# Products with fewer multiply-adds than this are not worth the cost of
+# starting worker processes.
+PARALLEL_THRESHOLD = 200**3
+
+
+def parallel_multiply_matrices(
+    matrix1: AnyMatrix,
+    matrix2: AnyMatrix,
+    workers: Optional[int] = None,
+    block_size: Optional[int] = None,
+) -> AnyMatrix:
+    """Multiplies two matrices using a pool of worker processes.
+
+    The output is split into row bands, one per worker. Both operands and the
+    result are placed in shared memory, so workers read and write them
+    directly instead of receiving pickled copies. Small products and products
+    involving a SparseMatrix are computed in the calling process.
+
+    Args:
+        matrix1 (AnyMatrix): The first matrix to be multiplied.
+        matrix2 (AnyMatrix): The second matrix to be multiplied.
+        workers (Optional[int]): The number of worker processes.
+            Defaults to the number of CPUs.
+        block_size (Optional[int]): Tile size passed to multiply_matrices
+            in every worker.
+
+    Raises:
+        ValueError: If either matrix is empty or if they are incompatible for multiplication.
+
+    Returns:
+        AnyMatrix: The product of matrix1 and matrix2, of the same
+        representation as multiply_matrices would return.
+    """
+    rows, inner, columns = _check_product_shapes(_shape(matrix1), _shape(matrix2))
+    if block_size is not None and block_size < 0:
+        raise ValueError("Block size must be non-negative.")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, rows)
+    if (
+        isinstance(matrix1, SparseMatrix)
+        or isinstance(matrix2, SparseMatrix)
+        or workers <= 1
+        or not columns
+        or rows * inner * columns < PARALLEL_THRESHOLD
+    ):
+        return multiply_matrices(matrix1, matrix2, block_size)
+
+    segments: List[SharedMemory] = []
+    try:
+        segments.append(_to_shared_memory(matrix1))
+        segments.append(_to_shared_memory(matrix2))
+        segments.append(SharedMemory(create=True, size=8 * rows * columns))
+        names = (segments[0].name, segments[1].name, segments[2].name)
+        bounds = [rows * band // workers for band in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _multiply_band,
+                    names,
+                    (rows, inner, columns),
+                    start,
+                    stop,
+                    block_size,
+                )
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+
+        result = _segment_buffer(segments[2]).cast("d")
+        try:
+            product = Matrix(array("d", result), (rows, columns))
+            if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+                return product
+            return product.tolist()
+        finally:
+            result.release()
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def _to_shared_memory(matrix: MatrixLike) -> SharedMemory:
+    """Copies a matrix into a new shared memory segment in row-major order."""
+    rows, columns = _shape(matrix)
+    if isinstance(matrix, Matrix):
+        data = matrix.data if matrix.is_contiguous() else matrix.copy().data
+    else:
+        data = array("d", chain.from_iterable(matrix))
+
+    segment = SharedMemory(create=True, size=max(8 * rows * columns, 1))
+    if rows and columns:
+        buffer = _segment_buffer(segment).cast("d")
+        buffer[: rows * columns] = data
+        buffer.release()
+    return segment
+
+
+def _segment_buffer(segment: SharedMemory) -> memoryview:
+    """Returns the raw contents of an open shared memory segment."""
+    buffer = segment.buf
+    if buffer is None:
+        raise ValueError("Shared memory segment is closed.")
+    return buffer
+
+
+def _multiply_band(
+    names: Tuple[str, str, str],
+    shape: Tuple[int, int, int],
+    start: int,
+    stop: int,
+    block_size: Optional[int],
+) -> None:
+    """Computes rows [start, stop) of a product stored in shared memory.
+
+    Runs in a worker process of parallel_multiply_matrices. The kernels read
+    the operands through views of the shared segments, so a worker holds no
+    copy of matrix2; only its band of the result is built as Python floats.
+    """
+    _, inner, columns = shape
+    segments = [SharedMemory(name=name) for name in names]
+    buffers = [_segment_buffer(segment).cast("d") for segment in segments]
+    views: List["memoryview[float]"] = []
+    try:
+        matrix1, matrix2, result = buffers
+        band = [matrix1[i * inner : (i + 1) * inner] for i in range(start, stop)]
+        rows2 = [matrix2[k * columns : (k + 1) * columns] for k in range(inner)]
+        views = band + rows2
+
+        if block_size:
+            product = _multiply_blocked(band, rows2, block_size)
+        else:
+            product = _multiply_rows(band, rows2)
+        result[start * columns : stop * columns] = array(
+            "d", chain.from_iterable(product)
+        )
+    finally:
+        # Segments cannot be closed while views of them exist
+        for view in views:
+            view.release()
+        for buffer in buffers:
+            buffer.release()
+        for segment in segments:
+            segment.close()
+
+
+@overload
 def transpose(matrix: List[List[float]]) -> List[List[float]]:
+    ...
+
+
+@overload
+def transpose(matrix: Matrix) -> Matrix:
+    ...
+
+
+@overload
+def transpose(matrix: SparseMatrix) -> SparseMatrix:
+    ...
+
+
+def transpose(matrix: AnyMatrix) -> AnyMatrix:
     """Transposes a matrix.
 
     Args:
-        matrix (List[List[float]]): The original matrix.
+        matrix (AnyMatrix): The original matrix.
 
     Returns:
-        List[List[float]]: Transposed matrix.
+        AnyMatrix: Transposed matrix. For a Matrix this is a view sharing
+        the original buffer rather than a copy.
 
     If the input matrix is ​​empty, returns an empty matrix.
     """
+    if isinstance(matrix, (Matrix, SparseMatrix)):
+        return matrix.T
+
     if not matrix:
         return []
 
     return [
         [float(matrix[j][i]) for j in range(len(matrix))] for i in range(len(matrix[0]))
     ]
+
+
+def _batch_count(batch: Sequence[float], shape: Shape) -> int:
+    """Returns the number of matrices of the given shape stored in a flat buffer.
+
+    Raises:
+        ValueError: If the shape is empty or the buffer length is not a
+            multiple of the matrix size.
+    """
+    rows, columns = shape
+    if rows <= 0 or columns <= 0:
+        raise ValueError("Matrices cannot be empty.")
+    count, remainder = divmod(len(batch), rows * columns)
+    if remainder:
+        raise ValueError("Batch length must be a multiple of the matrix size.")
+    return count
+
+
+def batch_add(
+    batch1: Sequence[float], batch2: Sequence[float], shape: Shape
+) -> "array[float]":
+    """Adds two stacks of matrices of the same shape pairwise.
+
+    Each stack is a flat buffer holding the matrices one after another in
+    row-major order. Shapes are validated once for the whole stack.
+
+    Args:
+        batch1 (Sequence[float]): The first stack of matrices.
+        batch2 (Sequence[float]): The second stack of matrices.
+        shape (Shape): The number of rows and columns of every matrix.
+
+    Raises:
+        ValueError: If the stacks have different lengths or do not hold
+            whole matrices of the given shape.
+
+    Returns:
+        array[float]: The stack of pairwise sums.
+    """
+    _batch_count(batch1, shape)
+    if len(batch1) != len(batch2):
+        raise ValueError("Batches must hold the same number of matrices.")
+    return array("d", map(add, batch1, batch2))
+
+
+def batch_multiply(
+    batch1: Sequence[float],
+    batch2: Sequence[float],
+    shape1: Shape,
+    shape2: Optional[Shape] = None,
+) -> "array[float]":
+    """Multiplies two stacks of matrices pairwise.
+
+    Each stack is a flat buffer holding the matrices one after another in
+    row-major order. Shapes are validated once for the whole stack, and
+    2x2, 3x3 and 4x4 products use unrolled kernels.
+
+    Args:
+        batch1 (Sequence[float]): The first stack of matrices.
+        batch2 (Sequence[float]): The second stack of matrices.
+        shape1 (Shape): The shape of every matrix in batch1.
+        shape2 (Optional[Shape]): The shape of every matrix in batch2.
+            Defaults to shape1.
+
+    Raises:
+        ValueError: If the stacks hold different numbers of matrices, do not
+            hold whole matrices of their shapes, or the shapes are
+            incompatible for multiplication.
+
+    Returns:
+        array[float]: The stack of pairwise products.
+    """
+    if shape2 is None:
+        shape2 = shape1
+    count = _batch_count(batch1, shape1)
+    if count != _batch_count(batch2, shape2):
+        raise ValueError("Batches must hold the same number of matrices.")
+    if shape1[1] != shape2[0]:
+        raise ValueError("Incompatible matrices for multiplication.")
+
+    kernel = _UNROLLED_KERNELS.get(shape1[0])
+    if kernel is not None and shape1 == shape2 == (shape1[0], shape1[0]):
+        return array("d", kernel(batch1, batch2))
+
+    (rows, inner), columns = shape1, shape2[1]
+    size1, size2 = rows * inner, inner * columns
+    result = array("d")
+    for index in range(count):
+        start1, start2 = index * size1, index * size2
+        matrix1 = [
+            batch1[start1 + i * inner : start1 + (i + 1) * inner] for i in range(rows)
+        ]
+        matrix2 = [
+            batch2[start2 + k * columns : start2 + (k + 1) * columns]
+            for k in range(inner)
+        ]
+        for row in _multiply_rows(matrix1, matrix2):
+            result.extend(row)
+    return result
+
+
+def batch_transpose(batch: Sequence[float], shape: Shape) -> "array[float]":
+    """Transposes every matrix in a stack.
+
+    The stack is a flat buffer holding the matrices one after another in
+    row-major order. Every element position is copied for the whole stack
+    with a single strided slice assignment.
+
+    Args:
+        batch (Sequence[float]): The stack of matrices.
+        shape (Shape): The number of rows and columns of every matrix.
+
+    Raises:
+        ValueError: If the buffer does not hold whole matrices of the given shape.
+
+    Returns:
+        array[float]: The stack of transposed matrices, each of shape
+        (columns, rows).
+    """
+    _batch_count(batch, shape)
+    rows, columns = shape
+    size = rows * columns
+    source = batch if isinstance(batch, array) else array("d", batch)
+    result = array("d", bytes(8 * len(source)))
+    for i in range(rows):
+        for j in range(columns):
+            result[j * rows + i :: size] = source[i * columns + j :: size]
+    return result
+
+
+def _multiply_2x2(batch1: Sequence[float], batch2: Sequence[float]) -> List[float]:
+    """Unrolled kernel for a stack of 2x2 products."""
+    result: List[float] = []
+    extend = result.extend
+    for start in range(0, len(batch1), 4):
+        a00, a01, a10, a11 = batch1[start : start + 4]
+        b00, b01, b10, b11 = batch2[start : start + 4]
+        extend(
+            (
+                a00 * b00 + a01 * b10,
+                a00 * b01 + a01 * b11,
+                a10 * b00 + a11 * b10,
+                a10 * b01 + a11 * b11,
+            )
+        )
+    return result
+
+
+def _multiply_3x3(batch1: Sequence[float], batch2: Sequence[float]) -> List[float]:
+    """Unrolled kernel for a stack of 3x3 products."""
+    result: List[float] = []
+    extend = result.extend
+    for start in range(0, len(batch1), 9):
+        a00, a01, a02, a10, a11, a12, a20, a21, a22 = batch1[start : start + 9]
+        b00, b01, b02, b10, b11, b12, b20, b21, b22 = batch2[start : start + 9]
+        extend(
+            (
+                a00 * b00 + a01 * b10 + a02 * b20,
+                a00 * b01 + a01 * b11 + a02 * b21,
+                a00 * b02 + a01 * b12 + a02 * b22,
+                a10 * b00 + a11 * b10 + a12 * b20,
+                a10 * b01 + a11 * b11 + a12 * b21,
+                a10 * b02 + a11 * b12 + a12 * b22,
+                a20 * b00 + a21 * b10 + a22 * b20,
+                a20 * b01 + a21 * b11 + a22 * b21,
+                a20 * b02 + a21 * b12 + a22 * b22,
+            )
+        )
+    return result
+
+
+def _multiply_4x4(batch1: Sequence[float], batch2: Sequence[float]) -> List[float]:
+    """Unrolled kernel for a stack of 4x4 products."""
+    result: List[float] = []
+    extend = result.extend
+    for start in range(0, len(batch1), 16):
+        (
+            a00,
+            a01,
+            a02,
+            a03,
+            a10,
+            a11,
+            a12,
+            a13,
+            a20,
+            a21,
+            a22,
+            a23,
+            a30,
+            a31,
+            a32,
+            a33,
+        ) = batch1[start : start + 16]
+        (
+            b00,
+            b01,
+            b02,
+            b03,
+            b10,
+            b11,
+            b12,
+            b13,
+            b20,
+            b21,
+            b22,
+            b23,
+            b30,
+            b31,
+            b32,
+            b33,
+        ) = batch2[start : start + 16]
+        extend(
+            (
+                a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30,
+                a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31,
+                a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32,
+                a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33,
+                a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30,
+                a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31,
+                a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32,
+                a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33,
+                a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30,
+                a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31,
+                a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32,
+                a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33,
+                a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30,
+                a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31,
+                a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32,
+                a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33,
+            )
+        )
+    return result
+
+
+_UNROLLED_KERNELS: Dict[
+    int, Callable[[Sequence[float], Sequence[float]], List[float]]
+] = {
+    2: _multiply_2x2,
+    3: _multiply_3x3,
+    4: _multiply_4x4,
+}
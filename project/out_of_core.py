@@ -0,0 +1,165 @@
+import math
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+from operator import add
+from typing import Iterator
+
+from project.matrix_operation import Shape, _accumulate_rows, _check_product_shapes
+
+# Operands are read from, and results written to, raw binary files: the
+# elements of a matrix as native-endian float64 values in row-major order,
+# with no header. Such a file can be produced with ``array("d", ...).tofile``.
+
+DEFAULT_TILE_BUDGET = 64 * 2**20
+
+# Approximate memory taken by one element while a tile is processed: a float
+# object and the list slot referencing it.
+_BYTES_PER_ELEMENT = 32
+
+
+@contextmanager
+def _mapped(path: str, shape: Shape, writable: bool = False) -> Iterator[mmap.mmap]:
+    """Memory-maps a matrix file.
+
+    A writable file is created, or truncated, to the size of the matrix.
+
+    Raises:
+        ValueError: If a read-only file does not hold a matrix of the given shape.
+    """
+    size = 8 * shape[0] * shape[1]
+    with open(path, "w+b" if writable else "rb") as file:
+        if writable:
+            file.truncate(size)
+        elif os.fstat(file.fileno()).st_size != size:
+            raise ValueError(f"File {path} does not hold a matrix of shape {shape}.")
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with mmap.mmap(file.fileno(), size, access=access) as mapping:
+            yield mapping
+            if writable:
+                mapping.flush()
+
+
+def _read(mapping: mmap.mmap, start: int, end: int) -> "array[float]":
+    """Copies elements [start, end) of a mapped matrix into memory."""
+    return array("d", mapping[8 * start : 8 * end])
+
+
+def _write(mapping: mmap.mmap, start: int, values: "array[float]") -> None:
+    """Writes elements to a mapped matrix, starting at the given position."""
+    mapping[8 * start : 8 * (start + len(values))] = values.tobytes()
+
+
+def _check_output(output_path: str, *paths: str) -> None:
+    """Rejects an output file that would overwrite one of the operands."""
+    output = os.path.realpath(output_path)
+    if any(output == os.path.realpath(path) for path in paths):
+        raise ValueError("Output file must differ from the operand files.")
+
+
+def _tile_size(tile_budget: int, tiles: int) -> int:
+    """Returns the edge of square tiles such that the given number fit the budget."""
+    if tile_budget <= 0:
+        raise ValueError("Tile budget must be positive.")
+    return max(1, math.isqrt(tile_budget // (tiles * _BYTES_PER_ELEMENT)))
+
+
+def add_matrix_files(
+    path1: str,
+    path2: str,
+    output_path: str,
+    shape: Shape,
+    tile_budget: int = DEFAULT_TILE_BUDGET,
+) -> None:
+    """Adds two matrices stored in files and writes the sum to a file.
+
+    The operands are memory-mapped and summed chunk by chunk, so only about
+    tile_budget bytes of elements are held in memory at a time.
+
+    Args:
+        path1 (str): The file with the first matrix.
+        path2 (str): The file with the second matrix.
+        output_path (str): The file to write the sum to.
+        shape (Shape): The number of rows and columns of both matrices.
+        tile_budget (int): The approximate memory budget in bytes.
+
+    Raises:
+        ValueError: If the matrices are empty or the files do not hold
+            matrices of the given shape, or output_path is one of the
+            operand files.
+    """
+    rows, columns = shape
+    if rows <= 0 or columns <= 0:
+        raise ValueError("Matrices cannot be empty.")
+    _check_output(output_path, path1, path2)
+    chunk = _tile_size(tile_budget, 3) ** 2
+
+    with _mapped(path1, shape) as matrix1, _mapped(path2, shape) as matrix2:
+        with _mapped(output_path, shape, writable=True) as result:
+            for start in range(0, rows * columns, chunk):
+                end = min(start + chunk, rows * columns)
+                values = map(
+                    add, _read(matrix1, start, end), _read(matrix2, start, end)
+                )
+                _write(result, start, array("d", values))
+
+
+def multiply_matrix_files(
+    path1: str,
+    path2: str,
+    output_path: str,
+    shape1: Shape,
+    shape2: Shape,
+    tile_budget: int = DEFAULT_TILE_BUDGET,
+) -> None:
+    """Multiplies two matrices stored in files and writes the product to a file.
+
+    The operands are memory-mapped and the product is computed one square
+    output tile at a time, streaming the matching tiles of the operands
+    through memory. Only three tiles are resident at once, so peak memory is
+    bounded by tile_budget rather than by the size of the matrices.
+    Products are accumulated in the same order as in multiply_matrices,
+    so the result is identical to the in-memory one.
+
+    Args:
+        path1 (str): The file with the first matrix.
+        path2 (str): The file with the second matrix.
+        output_path (str): The file to write the product to.
+        shape1 (Shape): The shape of the first matrix.
+        shape2 (Shape): The shape of the second matrix.
+        tile_budget (int): The approximate memory budget in bytes.
+
+    Raises:
+        ValueError: If either matrix is empty, the matrices are incompatible
+            for multiplication, the files do not hold matrices of the
+            given shapes, or output_path is one of the operand files.
+    """
+    rows, inner, columns = _check_product_shapes(shape1, shape2)
+    if inner <= 0 or columns <= 0:
+        raise ValueError("Matrices cannot be empty.")
+    _check_output(output_path, path1, path2)
+    tile = _tile_size(tile_budget, 3)
+
+    with _mapped(path1, shape1) as matrix1, _mapped(path2, shape2) as matrix2:
+        with _mapped(output_path, (rows, columns), writable=True) as result:
+            for i_start in range(0, rows, tile):
+                i_end = min(i_start + tile, rows)
+                for j_start in range(0, columns, tile):
+                    j_end = min(j_start + tile, columns)
+                    band = [[0.0] * (j_end - j_start) for _ in range(i_start, i_end)]
+
+                    for k_start in range(0, inner, tile):
+                        k_end = min(k_start + tile, inner)
+                        tile1 = [
+                            _read(matrix1, i * inner + k_start, i * inner + k_end)
+                            for i in range(i_start, i_end)
+                        ]
+                        tile2 = [
+                            _read(matrix2, k * columns + j_start, k * columns + j_end)
+                            for k in range(k_start, k_end)
+                        ]
+                        _accumulate_rows(band, tile1, tile2)
+
+                    for i, row in zip(range(i_start, i_end), band):
+                        _write(result, i * columns + j_start, array("d", row))
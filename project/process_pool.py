@@ -0,0 +1,349 @@
+import logging
+import math
+import os
+import pickle
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from project.matrix_operation import (
+    Matrix,
+    MatrixLike,
+    _segment_buffer,
+    _shape,
+    _to_shared_memory,
+)
+from project.threads import _results
+
+logger = logging.getLogger(__name__)
+
+# A call scheduled on the pool: the function with its arguments.
+Call = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+
+
+class SharedMatrix:
+    """
+    A matrix copied into shared memory once and passed to tasks by name.
+
+    A task receiving a SharedMatrix among its arguments gets a Matrix over the
+    shared segment instead, so the elements are never pickled. The matrix is
+    read-only by convention and valid only while the task runs.
+
+    Args:
+        matrix (MatrixLike): The matrix to copy into shared memory.
+    """
+
+    def __init__(self, matrix: MatrixLike) -> None:
+        self.shape = _shape(matrix)
+        self._segment: Optional[SharedMemory] = _to_shared_memory(matrix)
+        self.name = self._segment.name
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return _SharedMatrixName, (self.name, self.shape)
+
+    def release(self) -> None:
+        """Frees the shared segment. Tasks must not receive it afterwards."""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+
+class _SharedMatrixName:
+    """What a SharedMatrix becomes in a worker: a reference to its segment."""
+
+    def __init__(self, name: str, shape: Tuple[int, int]) -> None:
+        self.name = name
+        self.shape = shape
+
+
+class ProcessPool:
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        batch_size: int = 16,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        """
+        Initializes a pool of worker processes with the interface of ThreadPool.
+
+        The worker processes are started once and reused for all tasks, so
+        CPU-bound tasks run in parallel without the GIL. Tasks and their
+        results are pickled, so they must be picklable: module-level functions
+        or functools.partial objects of them.
+
+        Tasks are sent to the workers in batches. While some worker is free,
+        waiting tasks are split evenly among the workers; while all of them
+        are busy, tasks accumulate into batches of up to batch_size, so that
+        many small tasks share the cost of one message.
+
+        Args:
+            pool_size (Optional[int]): The number of processes. Defaults to the
+                                       number of CPUs.
+            batch_size (int): The largest number of tasks sent in one message.
+            mp_context (Optional[BaseContext]): The multiprocessing context
+                                                used to start the processes.
+
+        Raises:
+            ValueError: If pool_size or batch_size is not positive.
+        """
+        if pool_size is None:
+            pool_size = os.cpu_count() or 1
+        if pool_size <= 0 or batch_size <= 0:
+            raise ValueError("Pool size and batch size must be positive.")
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.is_disposed = False
+        self._executor = ProcessPoolExecutor(pool_size, mp_context)
+        self._pending: Deque[Tuple[Future, Call]] = deque()
+        self._in_flight = 0
+        self._shared: List[SharedMatrix] = []
+
+    @property
+    def tasks(self) -> List[Callable]:
+        """The tasks not yet sent to a worker process."""
+        with self.lock:
+            return [fn for _, (fn, _, _) in self._pending]
+
+    def enqueue(self, task: Callable) -> None:
+        """
+        Adds a task to the queue. The task should be a picklable callable.
+
+        An exception raised by the task is logged.
+
+        Args:
+            task (Callable): The task to be executed by the pool.
+
+        Raises:
+            RuntimeError: If the pool has been disposed.
+        """
+        self.submit(task).add_done_callback(_log_failure)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedules a call in a worker process and returns a future for its result.
+
+        Args:
+            fn (Callable[..., Any]): The picklable function to call.
+            *args (Any): Picklable positional arguments for the call.
+            **kwargs (Any): Picklable keyword arguments for the call.
+
+        Returns:
+            Future: The future that receives the result or the exception.
+
+        Raises:
+            RuntimeError: If the pool has been disposed.
+        """
+        future: Future = Future()
+        with self.lock:
+            if self.is_disposed:
+                raise RuntimeError("Cannot schedule new tasks after dispose.")
+            self._pending.append((future, (fn, args, kwargs)))
+        self._dispatch()
+        return future
+
+    def map(
+        self,
+        fn: Callable[..., Any],
+        *iterables: Iterable[Any],
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Any]:
+        """
+        Calls a function on items of the iterables in the worker processes.
+
+        All calls are scheduled before the first result is returned. If a call
+        raised an exception, it is raised when its result would be returned.
+
+        Args:
+            fn (Callable[..., Any]): The picklable function to call.
+            *iterables (Iterable[Any]): Iterables whose items are passed to fn,
+                                        as in the builtin map.
+            ordered (bool): If True, results are returned in the order of the
+                            items, otherwise in the order the calls finish.
+            timeout (Optional[float]): Seconds to wait for all results.
+
+        Returns:
+            Iterator[Any]: The results of the calls.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the results are not ready
+                                             in time.
+        """
+        futures = [self.submit(fn, *items) for items in zip(*iterables)]
+        return _results(futures, ordered, timeout)
+
+    def share(self, matrix: MatrixLike) -> SharedMatrix:
+        """
+        Copies a matrix into shared memory to pass it to many tasks cheaply.
+
+        The segment is freed on dispose, or earlier by SharedMatrix.release.
+
+        Args:
+            matrix (MatrixLike): The matrix to share.
+
+        Returns:
+            SharedMatrix: The handle to pass to tasks instead of the matrix.
+        """
+        shared = SharedMatrix(matrix)
+        with self.lock:
+            self._shared.append(shared)
+        return shared
+
+    def _dispatch(self, force: bool = False) -> None:
+        """Sends waiting tasks to the workers if a batch is due."""
+        batches = []
+        with self.lock:
+            while self._pending and (
+                force
+                or self._in_flight < self.pool_size
+                or len(self._pending) >= self.batch_size
+            ):
+                share = math.ceil(len(self._pending) / self.pool_size)
+                size = min(self.batch_size, share)
+                batch = [self._pending.popleft() for _ in range(size)]
+                # Tasks cancelled while waiting are dropped here
+                batch = [
+                    item for item in batch if item[0].set_running_or_notify_cancel()
+                ]
+                if batch:
+                    self._in_flight += 1
+                    batches.append(batch)
+
+        for batch in batches:
+            self._send(batch)
+
+    def _send(self, batch: List[Tuple[Future, Call]]) -> None:
+        """Sends a batch to the workers. It must be counted as in flight."""
+        try:
+            done = self._executor.submit(_run_batch, [call for _, call in batch])
+        except Exception as error:
+            self._batch_failed(batch, error)
+            return
+        done.add_done_callback(partial(self._batch_done, batch))
+
+    def _batch_done(self, batch: List[Tuple[Future, Call]], done: Future) -> None:
+        """Passes the outcomes of a batch to the futures of its tasks."""
+        error = done.exception()
+        if error is not None:
+            self._batch_failed(batch, error)
+            return
+        for (future, _), (failed, data) in zip(batch, done.result()):
+            try:
+                value = pickle.loads(data)
+            except Exception as error:
+                failed, value = True, error
+            if failed:
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+        with self.lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    def _batch_failed(
+        self, batch: List[Tuple[Future, Call]], error: BaseException
+    ) -> None:
+        """
+        Handles a batch that could not be run as a whole, for example because
+        one of its tasks cannot be pickled: its tasks are sent again one by
+        one, so that only the faulty task fails.
+        """
+        if len(batch) > 1:
+            with self.lock:
+                self._in_flight += len(batch) - 1
+            for item in batch:
+                self._send([item])
+            return
+        for future, _ in batch:
+            future.set_exception(error)
+        with self.lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    def dispose(self) -> None:
+        """
+        Disposes of the pool: runs the queued tasks, stops the worker processes
+        and frees the shared matrices.
+        """
+        with self.lock:
+            if self.is_disposed:
+                return
+            self.is_disposed = True
+        self._dispatch(force=True)
+        self._executor.shutdown(wait=True)
+        for shared in self._shared:
+            shared.release()
+        self._shared.clear()
+
+
+def _run_batch(calls: List[Call]) -> List[Tuple[bool, bytes]]:
+    """
+    Runs a batch of calls in a worker process.
+
+    Every outcome is pickled on its own, so that a result or an exception
+    that cannot be pickled fails only its own task.
+
+    Returns:
+        List[Tuple[bool, bytes]]: For every call, whether it failed, and its
+                                  pickled result or exception.
+    """
+    outcomes: List[Tuple[bool, bytes]] = []
+    for fn, args, kwargs in calls:
+        segments: List[SharedMemory] = []
+        try:
+            args = tuple(_attach(arg, segments) for arg in args)
+            kwargs = {name: _attach(arg, segments) for name, arg in kwargs.items()}
+            outcome: Tuple[bool, Any] = (False, fn(*args, **kwargs))
+        except Exception as error:
+            outcome = (True, error)
+        finally:
+            del args, kwargs
+            _detach(segments)
+        outcomes.append(_pickle_outcome(*outcome))
+    return outcomes
+
+
+def _pickle_outcome(failed: bool, value: Any) -> Tuple[bool, bytes]:
+    """Pickles the outcome of a call, replacing it by the pickling error."""
+    try:
+        return failed, pickle.dumps(value)
+    except Exception as error:
+        message = f"Cannot pickle the {'exception' if failed else 'result'}: {error}"
+        return True, pickle.dumps(pickle.PicklingError(message))
+
+
+def _attach(arg: Any, segments: List[SharedMemory]) -> Any:
+    """Replaces a shared matrix reference by a Matrix over its segment."""
+    if not isinstance(arg, _SharedMatrixName):
+        return arg
+    rows, columns = arg.shape
+    if not rows or not columns:
+        return Matrix(array("d"), arg.shape)
+    segment = SharedMemory(name=arg.name)
+    segments.append(segment)
+    data = _segment_buffer(segment).cast("d")[: rows * columns]
+    return Matrix(data, arg.shape)
+
+
+def _detach(segments: List[SharedMemory]) -> None:
+    """Closes the segments attached for a task."""
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            # The task kept a view of the matrix; the mapping is freed
+            # together with it.
+            pass
+
+
+def _log_failure(future: Future) -> None:
+    """Logs the exception of a task scheduled by enqueue."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Task raised an exception", exc_info=future.exception())
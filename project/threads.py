@@ -1,60 +1,802 @@
+import logging
+import math
+import queue
 import threading
-from typing import Callable, List
+import time
+from collections import deque
 
+# wait and as_completed of concurrent.futures work with the futures returned
+# by ThreadPool.submit, so they are imported here as the helpers of the pool.
+from concurrent.futures import Future, as_completed, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkerState(threading.local):
+    """The task queue of the worker running in the current thread, if any."""
+
+    queue: Optional[Deque[Callable]] = None
+
+
+class ResizeEvent(NamedTuple):
+    """A change of the number of workers of an autoscaling ThreadPool."""
+
+    old_size: int
+    new_size: int
+    reason: str
+
+
+class Histogram(NamedTuple):
+    """
+    A distribution of durations in seconds.
+
+    buckets holds pairs of an upper bound and the number of durations up to
+    that bound and above the previous one. The bounds double from one
+    microsecond; the last one is infinite.
+    """
+
+    samples: int
+    total: float
+    max: float
+    buckets: Tuple[Tuple[float, int], ...]
+
+    @property
+    def mean(self) -> float:
+        """The mean duration, or 0 if there are none."""
+        return self.total / self.samples if self.samples else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile of the durations.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The upper bound of the bucket holding the quantile, but
+                   at most the largest duration.
+        """
+        rank = q * self.samples
+        seen = 0
+        for bound, count in self.buckets:
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class PoolMetrics(NamedTuple):
+    """A snapshot of the metrics of a ThreadPool."""
+
+    tasks_enqueued: int
+    tasks_completed: int
+    tasks_failed: int
+    queue_depth: int
+    pool_size: int
+    busy_workers: int
+    # The share of the worker time since the pool started spent on tasks
+    utilization: float
+    queue_wait: Histogram
+    run_time: Histogram
+
+
+class _Histogram:
+    """Counts durations in buckets whose bounds double from a microsecond."""
+
+    BUCKETS = 28
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        _, exponent = math.frexp(seconds * 1e6)
+        self.counts[min(max(exponent, 0), self.BUCKETS - 1)] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @classmethod
+    def merge(cls, histograms: Iterable["_Histogram"]) -> Histogram:
+        """Adds up histograms into a snapshot."""
+        counts = [0] * cls.BUCKETS
+        total = 0.0
+        longest = 0.0
+        for histogram in histograms:
+            counts = [x + y for x, y in zip(counts, histogram.counts)]
+            total += histogram.total
+            longest = max(longest, histogram.max)
+        bounds = [2.0**index / 1e6 for index in range(cls.BUCKETS - 1)]
+        bounds.append(math.inf)
+        return Histogram(sum(counts), total, longest, tuple(zip(bounds, counts)))
+
+
+class _WorkerMetrics:
+    """The measurements of one worker. Only that worker updates them."""
+
+    def __init__(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.queue_wait = _Histogram()
+        self.run_time = _Histogram()
+
+    def finished(self, wait: float, run_time: float, failed: bool) -> None:
+        self.completed += 1
+        self.failed += failed
+        self.busy_time += run_time
+        self.queue_wait.add(wait)
+        self.run_time.add(run_time)
+
+
+class _Metrics:
+    """
+    The counters behind ThreadPool.metrics.
+
+    Every worker records its tasks in its own _WorkerMetrics without locking,
+    so a snapshot taken while tasks run may be slightly inconsistent.
+    """
 
-class ThreadPool:
     def __init__(self, pool_size: int) -> None:
+        self.lock = threading.Lock()
+        self.enqueued = 0
+        # Replaced as a whole when a worker starts
+        self.workers: List[_WorkerMetrics] = []
+        # Worker seconds up to the last resize, and the time of that resize
+        self.capacity = 0.0
+        self.resized_at = time.perf_counter()
+        self.pool_size = pool_size
+
+    def added(self) -> None:
+        with self.lock:
+            self.enqueued += 1
+
+    def add_worker(self) -> _WorkerMetrics:
+        worker = _WorkerMetrics()
+        with self.lock:
+            self.workers = self.workers + [worker]
+        return worker
+
+    def resized(self, new_size: int) -> None:
+        now = time.perf_counter()
+        with self.lock:
+            self.capacity += self.pool_size * (now - self.resized_at)
+            self.resized_at = now
+            self.pool_size = new_size
+
+
+class _TimedTask:
+    """A task with the time it was enqueued, used when the pool is observed."""
+
+    __slots__ = ("task", "enqueued")
+
+    def __init__(self, task: Callable) -> None:
+        self.task = task
+        self.enqueued = time.perf_counter()
+
+    def __call__(self) -> None:
+        self.task()
+
+
+class _FutureTask:
+    """A call whose outcome is stored in a future."""
+
+    __slots__ = ("future", "fn", "args", "kwargs")
+
+    def __init__(
+        self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        self.future: Future = Future()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as error:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+
+class ThreadPool:
+    def __init__(
+        self,
+        pool_size: int,
+        max_size: Optional[int] = None,
+        keep_alive: float = 60.0,
+        scale_up_depth: int = 1,
+        scale_up_wait: Optional[float] = None,
+        on_resize: Optional[Callable[[ResizeEvent], None]] = None,
+        max_queue_size: int = 0,
+        queue_timeout: Optional[float] = None,
+        metrics: bool = False,
+        on_task_start: Optional[Callable[[Callable, float], None]] = None,
+        on_task_finish: Optional[
+            Callable[[Callable, float, float, Optional[BaseException]], None]
+        ] = None,
+    ) -> None:
         """
         Initializes the ThreadPool with a specified number of threads.
 
+        Idle workers sleep on a condition variable and are woken up by enqueue
+        and dispose, so an idle pool does not use the processor.
+
+        Tasks are scheduled by work stealing: tasks enqueued from outside the
+        pool go to a shared queue, tasks enqueued by a running task go to the
+        queue of its worker, and a worker without tasks takes them from the
+        other queues. Taking a task does not lock the pool, the lock is only
+        used to put idle workers to sleep and wake them up. Priority tasks go
+        to a separate lane that every worker checks first.
+
+        If max_size is larger than pool_size, the pool grows up to max_size
+        threads while tasks are waiting and no worker is idle, and shrinks
+        back to pool_size threads as workers stay idle for keep_alive seconds.
+        The load is checked whenever a task is enqueued. By default the pool
+        keeps pool_size threads.
+
+        If max_queue_size is positive, at most that many tasks wait in the
+        shared and priority queues. When they are full, enqueue blocks until
+        a task is taken, or gives up after queue_timeout seconds; with
+        queue_timeout=0 the task is rejected at once. Tasks enqueued by running
+        tasks to their own worker are not limited, so a worker never blocks
+        on its own pool.
+
+        With metrics=True the pool counts tasks and measures how long they
+        wait in the queue and run, read through the metrics method. The hooks
+        are called by the worker around every task; their exceptions are
+        logged. Without metrics and hooks tasks are not timed at all.
+
         Args:
-            pool_size (int): The number of threads in the pool.
+            pool_size (int): The number of threads in the pool, and the least
+                             number of threads of an autoscaling pool.
+            max_size (Optional[int]): The largest number of threads. If None,
+                                      the pool does not grow.
+            keep_alive (float): Seconds an extra worker stays idle before it
+                                exits.
+            scale_up_depth (int): A worker is added when this many tasks are
+                                  waiting and every worker is busy.
+            scale_up_wait (Optional[float]): A worker is also added when every
+                                             worker has been busy with tasks
+                                             waiting for this many seconds.
+            on_resize (Optional[Callable[[ResizeEvent], None]]): Called after
+                                                                 a worker is
+                                                                 added or exits.
+            max_queue_size (int): The largest number of waiting tasks.
+                                  If 0, the number is not limited.
+            queue_timeout (Optional[float]): Seconds to wait for space in a
+                                             full queue. If None, enqueue
+                                             waits as long as needed.
+            metrics (bool): If True, collects the metrics of the pool.
+            on_task_start (Optional[Callable[[Callable, float], None]]):
+                Called with the task and the seconds it waited in the queue
+                before the task starts.
+            on_task_finish (Optional[Callable[[Callable, float, float,
+                Optional[BaseException]], None]]): Called with the task, its
+                queue wait, its run time in seconds and the exception it
+                raised, if any, after the task has finished.
+
+        Raises:
+            ValueError: If max_size is smaller than pool_size.
         """
+        if max_size is not None and max_size < pool_size:
+            raise ValueError("max_size must not be smaller than pool_size.")
         self.pool_size = pool_size
-        self.tasks: List[Callable] = []
+        self.min_size = pool_size
+        self.max_size = pool_size if max_size is None else max_size
+        self.keep_alive = keep_alive
+        self.scale_up_depth = scale_up_depth
+        self.scale_up_wait = scale_up_wait
+        self.on_resize = on_resize
         self.lock = threading.Lock()
+        self.task_available = threading.Condition(self.lock)
         self.threads: List[threading.Thread] = []
         self.is_disposed = False
+        self._priority: Deque[Callable] = deque()
+        self._shared: Deque[Callable] = deque()
+        # Replaced as a whole when a worker starts or exits, so that it can be
+        # read without the lock.
+        self._local_queues: List[Deque[Callable]] = []
+        self._current = _WorkerState()
+        self._idle = 0
+        self._waking = False
+        self._busy_since: Optional[float] = None
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        # Counts the tasks in the shared and priority queues of a bounded pool
+        self._space: Optional[threading.Condition] = None
+        if max_queue_size > 0:
+            self._space = threading.Condition(threading.Lock())
+        self._queued = 0
+        self.on_task_start = on_task_start
+        self.on_task_finish = on_task_finish
+        self._metrics = _Metrics(pool_size) if metrics else None
+        self._observed = bool(metrics or on_task_start or on_task_finish)
         self._init_threads()
 
+    @property
+    def tasks(self) -> List[Callable]:
+        """The tasks waiting to be executed, in no particular order."""
+        tasks = list(self._priority) + list(self._shared)
+        for local in self._local_queues:
+            tasks.extend(local)
+        return [_unwrap(task) for task in tasks]
+
     def _init_threads(self) -> None:
         """Initializes the worker threads."""
         for _ in range(self.pool_size):
-            thread = threading.Thread(target=self.worker)
-            thread.start()
-            self.threads.append(thread)
+            self._start_thread()
+
+    def _start_thread(self) -> None:
+        """Starts a worker thread. Once the pool runs, the lock must be held."""
+        thread = threading.Thread(target=self.worker)
+        thread.start()
+        self.threads.append(thread)
 
     def worker(self) -> None:
         """
-        The worker function that processes tasks from the tasks list.
-        It runs in separate threads and continuously checks for tasks to execute.
+        The worker function that processes tasks from the task queues.
+        It runs in separate threads and sleeps until a task is enqueued.
+        Once the pool is shut down, it exits as soon as no task is left.
         """
-        while not self.is_disposed:
-            with self.lock:
-                if self.tasks:
-                    task = self.tasks.pop(0)
-                else:
-                    task = None
+        own: Deque[Callable] = deque()
+        self._current.queue = own
+        with self.lock:
+            self._local_queues = self._local_queues + [own]
+        stats = None if self._metrics is None else self._metrics.add_worker()
 
-            if task is not None:
+        while True:
+            task = self._take(own)
+            if task is None:
+                task = self._wait_for_task(own)
+            if task is None:
+                return
 
+            if type(task) is _TimedTask:
+                self._run_observed(task, stats)
+                continue
+            try:
                 task()
+            except Exception:
+                logger.exception("Task %r raised an exception", task)
+
+    def _run_observed(self, timed: _TimedTask, stats: Optional[_WorkerMetrics]) -> None:
+        """Runs a task, timing it and calling the hooks around it."""
+        task = timed.task
+        started = time.perf_counter()
+        wait = started - timed.enqueued
+        error: Optional[BaseException] = None
+        if self.on_task_start is not None:
+            try:
+                self.on_task_start(task, wait)
+            except Exception:
+                logger.exception("Task hook raised an exception")
+            started = time.perf_counter()
+        try:
+            task()
+        except Exception as exception:
+            error = exception
+            logger.exception("Task %r raised an exception", task)
+        run_time = time.perf_counter() - started
+        if error is None and isinstance(task, _FutureTask):
+            future = task.future
+            if not future.cancelled():
+                error = future.exception()
+        if stats is not None:
+            stats.finished(wait, run_time, error is not None)
+        if self.on_task_finish is not None:
+            try:
+                self.on_task_finish(task, wait, run_time, error)
+            except Exception:
+                logger.exception("Task hook raised an exception")
+
+    def _wait_for_task(self, own: Deque[Callable]) -> Optional[Callable]:
+        """
+        Sleeps until a task can be taken.
 
-    def enqueue(self, task: Callable) -> None:
+        Returns:
+            Optional[Callable]: The task, or None if the pool was shut down
+                                and no task is left, or the worker has been
+                                idle for too long and has to exit.
         """
-        Adds a task to the tasks list. The task should be callable.
+        task = None
+        event = None
+        with self.task_available:
+            self._idle += 1
+            self._busy_since = None
+            try:
+                while True:
+                    task = self._take(own)
+                    if task is not None or self.is_disposed:
+                        break
+                    extra = self.pool_size > self.min_size
+                    if self.task_available.wait(self.keep_alive if extra else None):
+                        self._waking = False
+                        continue
+                    # A notify racing with the timeout is lost for this worker,
+                    # so its wake-up is passed on to another sleeping worker.
+                    if self._waking:
+                        self._waking = False
+                        if self._idle > 1:
+                            self._waking = True
+                            self.task_available.notify()
+                    if self.pool_size > self.min_size:
+                        task = self._take(own)
+                        if task is None:
+                            event = self._retire(own)
+                        break
+            finally:
+                self._idle -= 1
+        if event is not None:
+            self._report(event)
+        # Tasks enqueued while this worker was waking up did not wake up
+        # anyone else.
+        if task is not None and self._has_tasks():
+            self._wake_idle()
+        return task
+
+    def _retire(self, own: Deque[Callable]) -> ResizeEvent:
+        """Removes the current worker from the pool. The lock must be held."""
+        self.threads.remove(threading.current_thread())
+        self._local_queues = [local for local in self._local_queues if local is not own]
+        self.pool_size -= 1
+        return ResizeEvent(self.pool_size + 1, self.pool_size, "idle")
+
+    def _take(self, own: Deque[Callable]) -> Optional[Callable]:
+        """
+        Takes the next task for a worker: a priority task, the newest task of
+        its own queue, the oldest shared task, or the oldest task of another
+        worker, in this order.
+        """
+        # The emptiness checks only avoid raising IndexError in the common
+        # case, another worker may still take the task in between.
+        try:
+            if self._priority:
+                return self._counted(self._priority.popleft())
+            if own:
+                return own.pop()
+            if self._shared:
+                return self._counted(self._shared.popleft())
+            for local in self._local_queues:
+                if local:
+                    return local.popleft()
+        except IndexError:
+            return self._take(own)
+        return None
+
+    def _counted(self, task: Callable) -> Callable:
+        """Frees the place of a task taken from a bounded queue."""
+        if self._space is not None:
+            with self._space:
+                self._queued -= 1
+                self._space.notify()
+        return task
+
+    def _has_tasks(self) -> bool:
+        """Checks whether any task is waiting to be executed."""
+        return bool(self._priority or self._shared or any(self._local_queues))
+
+    def enqueue(self, task: Callable, priority: bool = False) -> None:
+        """
+        Adds a task to the task queues. The task should be callable.
 
         Args:
             task (Callable): The task to be executed by the thread pool.
+            priority (bool): If True, the task is executed before all tasks
+                             enqueued without priority.
+
+        Raises:
+            queue.Full: If the queue stayed full for queue_timeout seconds.
+            RuntimeError: If the pool has been shut down.
+        """
+        own = self._current.queue
+        if own is None and self.is_disposed:
+            raise RuntimeError("Cannot schedule new tasks after shutdown.")
+        if priority:
+            lane = self._priority
+        else:
+            lane = self._shared if own is None else own
+        if lane is not own and self._space is not None:
+            self._reserve(self._space, block=own is None)
+        if self._observed:
+            task = _TimedTask(task)
+            if self._metrics is not None:
+                self._metrics.added()
+        lane.append(task)
+        if own is None and self.is_disposed:
+            # Shutdown has raced with this call; the workers may be gone
+            self._withdraw(lane, task)
+        if not self._wake_idle() and self.pool_size < self.max_size:
+            self._scale_up()
+
+    def _depth(self) -> int:
+        """Counts the tasks waiting to be executed."""
+        depth = len(self._priority) + len(self._shared)
+        return depth + sum(len(local) for local in self._local_queues)
+
+    def _reserve(self, space: threading.Condition, block: bool) -> None:
+        """
+        Takes a place in the bounded queue, waiting for it if block is True.
+
+        Raises:
+            queue.Full: If no place became free in time.
+            RuntimeError: If the pool was shut down while waiting.
+        """
+        with space:
+            if block and not space.wait_for(
+                lambda: self._queued < self.max_queue_size or self.is_disposed,
+                self.queue_timeout,
+            ):
+                raise queue.Full("Thread pool queue is full.")
+            if block and self.is_disposed:
+                raise RuntimeError("Cannot schedule new tasks after shutdown.")
+            self._queued += 1
+
+    def _withdraw(self, lane: Deque[Callable], task: Callable) -> None:
+        """
+        Removes a task enqueued during shutdown, unless a worker took it.
+
+        Raises:
+            RuntimeError: If the task was removed.
+        """
+        try:
+            lane.remove(task)
+        except ValueError:
+            return
+        self._counted(task)
+        raise RuntimeError("Cannot schedule new tasks after shutdown.")
+
+    def _scale_up(self) -> None:
+        """Adds a worker if tasks wait for too long or there are too many."""
+        now = time.monotonic()
+        with self.lock:
+            if (
+                self._idle > self._waking
+                or self.is_disposed
+                or self.pool_size >= self.max_size
+            ):
+                return
+            if self._busy_since is None:
+                self._busy_since = now
+            if self._depth() >= self.scale_up_depth:
+                reason = "depth"
+            elif (
+                self.scale_up_wait is not None
+                and now - self._busy_since >= self.scale_up_wait
+            ):
+                reason = "wait"
+            else:
+                return
+            self._start_thread()
+            self.pool_size += 1
+            self._busy_since = now
+            event = ResizeEvent(self.pool_size - 1, self.pool_size, reason)
+        self._report(event)
+
+    def _report(self, event: ResizeEvent) -> None:
+        """Logs a change of the pool size and passes it to on_resize."""
+        logger.debug(
+            "Thread pool resized from %d to %d workers (%s)",
+            event.old_size,
+            event.new_size,
+            event.reason,
+        )
+        if self._metrics is not None:
+            self._metrics.resized(event.new_size)
+        if self.on_resize is not None:
+            self.on_resize(event)
+
+    def _wake_idle(self) -> bool:
+        """
+        Wakes up an idle worker, unless one is already waking up.
+
+        A worker going to sleep counts itself as idle before it looks at the
+        queues for the last time, so it either sees a new task or is woken up.
+
+        Returns:
+            bool: Whether some worker is idle and not claimed yet.
+        """
+        if self._idle and not self._waking:
+            with self.task_available:
+                if self._idle and not self._waking:
+                    self._waking = True
+                    self.task_available.notify()
+        # The worker being woken up is about to take an earlier task.
+        return self._idle > self._waking
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedules a call and returns a future for its result.
+
+        An exception raised by the call is stored in the future instead of
+        stopping the worker.
+
+        Args:
+            fn (Callable[..., Any]): The function to call.
+            *args (Any): Positional arguments for the call.
+            **kwargs (Any): Keyword arguments for the call.
+
+        Returns:
+            Future: The future that receives the result or the exception.
         """
-        if not self.is_disposed:
-            with self.lock:
-                self.tasks.append(task)
+        return self._submit(fn, args, kwargs, False)
+
+    def submit_priority(
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        """
+        Schedules a call like submit, ahead of all tasks without priority.
+
+        Args:
+            fn (Callable[..., Any]): The function to call.
+            *args (Any): Positional arguments for the call.
+            **kwargs (Any): Keyword arguments for the call.
+
+        Returns:
+            Future: The future that receives the result or the exception.
+        """
+        return self._submit(fn, args, kwargs, True)
+
+    def _submit(
+        self,
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        priority: bool,
+    ) -> Future:
+        """Schedules a call whose outcome is stored in a future."""
+        task = _FutureTask(fn, args, kwargs)
+        self.enqueue(task, priority)
+        return task.future
+
+    def map(
+        self,
+        fn: Callable[..., Any],
+        *iterables: Iterable[Any],
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+        priority: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Calls a function on items of the iterables in parallel.
+
+        All calls are scheduled before the first result is returned. If a call
+        raised an exception, it is raised when its result would be returned.
+
+        Args:
+            fn (Callable[..., Any]): The function to call.
+            *iterables (Iterable[Any]): Iterables whose items are passed to fn,
+                                        as in the builtin map.
+            ordered (bool): If True, results are returned in the order of the
+                            items, otherwise in the order the calls finish.
+            timeout (Optional[float]): Seconds to wait for all results.
+            priority (bool): If True, the calls are scheduled with priority.
+
+        Returns:
+            Iterator[Any]: The results of the calls.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the results are not ready
+                                             in time.
+        """
+        futures = [self._submit(fn, items, {}, priority) for items in zip(*iterables)]
+        return _results(futures, ordered, timeout)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stops accepting tasks from outside the pool and lets the threads exit.
+
+        The workers first run the waiting tasks, including the ones that
+        running tasks enqueue, unless cancel_pending is True: then the
+        waiting tasks are dropped and the futures of submitted calls are
+        cancelled. Tasks that already run are always finished.
+
+        Args:
+            wait (bool): If True, waits until all threads have exited.
+            cancel_pending (bool): If True, drops the waiting tasks.
+        """
+        with self.task_available:
+            self.is_disposed = True
+            self.task_available.notify_all()
+        if self._space is not None:
+            with self._space:
+                self._space.notify_all()
+        if cancel_pending:
+            self._cancel_pending()
+        if wait:
+            for thread in list(self.threads):
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _cancel_pending(self) -> None:
+        """Drops the waiting tasks and cancels their futures."""
+        lanes = [self._priority, self._shared] + self._local_queues
+        for index, lane in enumerate(lanes):
+            while True:
+                try:
+                    task = lane.popleft()
+                except IndexError:
+                    break
+                if index < 2:
+                    self._counted(task)
+                task = _unwrap(task)
+                if isinstance(task, _FutureTask):
+                    task.future.cancel()
+
+    def metrics(self) -> PoolMetrics:
+        """
+        Takes a snapshot of the metrics of the pool.
+
+        Returns:
+            PoolMetrics: The counters and durations since the pool started.
+
+        Raises:
+            RuntimeError: If the pool was created without metrics=True.
+        """
+        metrics = self._metrics
+        if metrics is None:
+            raise RuntimeError("Metrics are disabled; pass metrics=True.")
+        now = time.perf_counter()
+        with metrics.lock:
+            enqueued = metrics.enqueued
+            pool_size = metrics.pool_size
+            capacity = metrics.capacity + pool_size * (now - metrics.resized_at)
+        workers = metrics.workers
+        busy_time = sum(worker.busy_time for worker in workers)
+        return PoolMetrics(
+            tasks_enqueued=enqueued,
+            tasks_completed=sum(worker.completed for worker in workers),
+            tasks_failed=sum(worker.failed for worker in workers),
+            queue_depth=self._depth(),
+            pool_size=pool_size,
+            busy_workers=pool_size - self._idle,
+            utilization=min(busy_time / capacity, 1.0) if capacity else 0.0,
+            queue_wait=_Histogram.merge(worker.queue_wait for worker in workers),
+            run_time=_Histogram.merge(worker.run_time for worker in workers),
+        )
 
     def dispose(self) -> None:
         """
-        Disposes of the thread pool, stopping all threads and waiting for them to finish.
+        Disposes of the thread pool: runs the waiting tasks, stops all threads
+        and waits for them to finish.
         """
-        self.is_disposed = True
-        for thread in self.threads:
-            thread.join()
+        self.shutdown()
+
+
+def _results(
+    futures: List[Future], ordered: bool, timeout: Optional[float]
+) -> Iterator[Any]:
+    """Yields the results of futures, cancelling the rest on early exit."""
+    try:
+        if ordered:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for future in futures:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                yield future.result(remaining)
+        else:
+            for future in as_completed(futures, timeout):
+                yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _unwrap(task: Callable) -> Callable:
+    """Returns the task enqueued by the caller of an observed pool."""
+    return task.task if isinstance(task, _TimedTask) else task
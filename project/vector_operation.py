@@ -1,13 +1,18 @@
+import heapq
 import math
-from typing import List
+import random
+from array import array
+from itertools import islice
+from operator import itemgetter, mul
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 
-def dot_product(a: List[float], b: List[float]) -> float:
+def dot_product(a: Sequence[float], b: Sequence[float]) -> float:
     """Calculates the dot product of two vectors.
 
     Args:
-        a (List[float]): The first vector.
-        b (List[float]): The second vector.
+        a (Sequence[float]): The first vector.
+        b (Sequence[float]): The second vector.
 
     Returns:
         float: The dot product of vectors a and b.
@@ -21,11 +26,11 @@ def dot_product(a: List[float], b: List[float]) -> float:
     return sum(x * y for x, y in zip(a, b))
 
 
-def vector_length(c: List[float]) -> float:
+def vector_length(c: Sequence[float]) -> float:
     """Calculates the length (magnitude) of a vector.
 
     Args:
-        c (List[float]): The vector.
+        c (Sequence[float]): The vector.
 
     Returns:
         float: The length of vector c.
@@ -34,13 +39,13 @@ def vector_length(c: List[float]) -> float:
 
 
 def angle_between_vectors(
-    a: List[float], b: List[float], verbose: bool = False
+    a: Sequence[float], b: Sequence[float], verbose: bool = False
 ) -> float:
     """Calculates the angle between two vectors in radians.
 
     Args:
-        a (List[float]): The first vector.
-        b (List[float]): The second vector.
+        a (Sequence[float]): The first vector.
+        b (Sequence[float]): The second vector.
         verbose (bool): If True, prints additional information.
 
     Returns:
@@ -73,3 +78,342 @@ def angle_between_vectors(
         print(f"Angle (in radians): {angle}")
 
     return angle
+
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _chunks(values: Iterable[float], chunk_size: int) -> Iterator["array[float]"]:
+    """Splits a stream of numbers into arrays of chunk_size elements."""
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    iterator = iter(values)
+    while True:
+        chunk = array("d", islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _neumaier_add(
+    total: float, compensation: float, values: List[float]
+) -> Tuple[float, float]:
+    """Adds a chunk of values to a compensated running sum.
+
+    The chunk is summed with math.fsum, and both the rounding error of that
+    sum and the error of adding it to the total go to the compensation.
+    """
+    value = math.fsum(values)
+    values.append(-value)
+    compensation += math.fsum(values)
+
+    result = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - result) + value
+    else:
+        compensation += (value - result) + total
+    return result, compensation
+
+
+def stream_dot_product(
+    a: Iterable[float], b: Iterable[float], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> float:
+    """Calculates the dot product of two vectors given as streams.
+
+    The streams are consumed in chunks of chunk_size elements, so memory use
+    does not depend on the vector length. Each chunk is summed with
+    math.fsum, and chunk sums are combined with Neumaier compensated
+    summation that also carries the rounding error of every chunk sum, so
+    long sums do not accumulate rounding errors.
+
+    Args:
+        a (Iterable[float]): The first vector, e.g. a generator.
+        b (Iterable[float]): The second vector.
+        chunk_size (int): The number of elements processed at a time.
+
+    Returns:
+        float: The dot product of vectors a and b.
+
+    Raises:
+        ValueError: If one stream ends before the other.
+    """
+    total = compensation = 0.0
+    chunks_b = _chunks(b, chunk_size)
+    for chunk_a in _chunks(a, chunk_size):
+        chunk_b = next(chunks_b, array("d"))
+        if len(chunk_a) != len(chunk_b):
+            raise ValueError("Vectors must have the same length.")
+        products = list(map(mul, chunk_a, chunk_b))
+        total, compensation = _neumaier_add(total, compensation, products)
+    if next(chunks_b, None) is not None:
+        raise ValueError("Vectors must have the same length.")
+    return total + compensation
+
+
+def stream_vector_length(
+    c: Iterable[float], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> float:
+    """Calculates the length of a vector given as a stream.
+
+    Uses the same chunked, compensated summation as stream_dot_product.
+
+    Args:
+        c (Iterable[float]): The vector, e.g. a generator.
+        chunk_size (int): The number of elements processed at a time.
+
+    Returns:
+        float: The length of vector c.
+    """
+    total = compensation = 0.0
+    for chunk in _chunks(c, chunk_size):
+        squares = list(map(mul, chunk, chunk))
+        total, compensation = _neumaier_add(total, compensation, squares)
+    return math.sqrt(total + compensation)
+
+
+class VectorIndex:
+    """A collection of vectors for repeated angle and similarity queries.
+
+    Vectors are stored back to back in one ``array('d')`` together with
+    their precomputed lengths, so a query computes only its own length and
+    one dot product per stored vector.
+    """
+
+    def __init__(self, dimension: int, vectors: Iterable[Sequence[float]] = ()) -> None:
+        """
+        Initializes the index.
+
+        Args:
+            dimension (int): The length of every stored vector.
+            vectors (Iterable[Sequence[float]]): Vectors to add initially.
+
+        Raises:
+            ValueError: If the dimension is not positive.
+        """
+        if dimension <= 0:
+            raise ValueError("Dimension must be positive.")
+        self.dimension = dimension
+        self.data = array("d")
+        self.lengths = array("d")
+        for vector in vectors:
+            self.add(vector)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, vector: Sequence[float]) -> int:
+        """
+        Adds a vector to the index.
+
+        Args:
+            vector (Sequence[float]): The vector.
+
+        Returns:
+            int: The position of the vector in the index.
+
+        Raises:
+            ValueError: If the vector has another dimension or is zero.
+        """
+        if len(vector) != self.dimension:
+            raise ValueError("Vectors must have the same length.")
+        length = vector_length(vector)
+        if length == 0:
+            raise ValueError("One of the vectors is zero.")
+        self.data.extend(vector)
+        self.lengths.append(length)
+        return len(self.lengths) - 1
+
+    def vector(self, index: int) -> Sequence[float]:
+        """Returns a copy of the stored vector at the given position."""
+        start = index * self.dimension
+        return self.data[start : start + self.dimension]
+
+    def _cosines(self, query: Sequence[float]) -> Iterable[Tuple[float, int]]:
+        """Yields the cosine between the query and every stored vector."""
+        if len(query) != self.dimension:
+            raise ValueError("Vectors must have the same length.")
+        query_length = vector_length(query)
+        if query_length == 0:
+            raise ValueError("One of the vectors is zero.")
+
+        data = self.data
+        dimension = self.dimension
+        for index, length in enumerate(self.lengths):
+            start = index * dimension
+            product = sum(map(mul, query, data[start : start + dimension]))
+            yield product / (query_length * length), index
+
+    def angles_to(self, query: Sequence[float]) -> List[float]:
+        """
+        Calculates the angles between a query and every stored vector.
+
+        Args:
+            query (Sequence[float]): The query vector.
+
+        Returns:
+            List[float]: The angles in radians, in the order of the stored vectors.
+
+        Raises:
+            ValueError: If the query has another dimension or is zero.
+        """
+        return [
+            math.acos(max(-1, min(1, cosine))) for cosine, _ in self._cosines(query)
+        ]
+
+    def top_k_similar(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """
+        Finds the stored vectors with the smallest angles to a query.
+
+        A heap of size k is kept while scanning, so the cost is
+        O(n log k) instead of sorting all n angles.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of vectors to return.
+
+        Returns:
+            List[Tuple[int, float]]: Positions of the closest vectors and
+            their angles to the query in radians, closest first.
+
+        Raises:
+            ValueError: If the query has another dimension or is zero.
+        """
+        best = heapq.nlargest(k, self._cosines(query), key=itemgetter(0))
+        return [(index, math.acos(max(-1, min(1, cosine)))) for cosine, index in best]
+
+
+class AngularLSHIndex:
+    """An approximate nearest-neighbour index over angles between vectors.
+
+    Every table hashes a vector to a signature of ``bits`` bits, one per
+    random hyperplane, telling on which side of the hyperplane the vector
+    lies. Vectors at a small angle agree on most bits, so they tend to land
+    in the same bucket of at least one table. A query only re-ranks the
+    vectors from its own buckets, using exact dot products.
+
+    More tables raise recall at the cost of memory and query time; more bits
+    make buckets smaller, which speeds up queries and lowers recall.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        tables: int = 8,
+        bits: int = 12,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            dimension (int): The length of every stored vector.
+            tables (int): The number of hash tables.
+            bits (int): The number of hyperplanes, and signature bits, per table.
+            seed (Optional[int]): Seed for generating the hyperplanes.
+
+        Raises:
+            ValueError: If any of the sizes is not positive.
+        """
+        if tables <= 0 or bits <= 0:
+            raise ValueError("Number of tables and bits must be positive.")
+        self.vectors = VectorIndex(dimension)
+        rng = random.Random(seed)
+        self.planes = [
+            [
+                array("d", (rng.gauss(0, 1) for _ in range(dimension)))
+                for _ in range(bits)
+            ]
+            for _ in range(tables)
+        ]
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(tables)]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _signatures(self, vector: Sequence[float]) -> List[int]:
+        """Returns the bucket key of a vector in every table."""
+        signatures = []
+        for planes in self.planes:
+            signature = 0
+            for plane in planes:
+                signature = (signature << 1) | (sum(map(mul, vector, plane)) >= 0)
+            signatures.append(signature)
+        return signatures
+
+    def add(self, vector: Sequence[float]) -> int:
+        """
+        Adds a vector to the index.
+
+        Args:
+            vector (Sequence[float]): The vector.
+
+        Returns:
+            int: The position of the vector in the index.
+
+        Raises:
+            ValueError: If the vector has another dimension or is zero.
+        """
+        position = self.vectors.add(vector)
+        for buckets, signature in zip(self.buckets, self._signatures(vector)):
+            buckets.setdefault(signature, []).append(position)
+        return position
+
+    def candidates(self, query: Sequence[float]) -> Set[int]:
+        """Returns positions of the vectors sharing a bucket with the query."""
+        if len(query) != self.vectors.dimension:
+            raise ValueError("Vectors must have the same length.")
+        found: Set[int] = set()
+        for buckets, signature in zip(self.buckets, self._signatures(query)):
+            found.update(buckets.get(signature, ()))
+        return found
+
+    def top_k_similar(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """
+        Finds approximately the stored vectors with the smallest angles to a query.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of vectors to return.
+
+        Returns:
+            List[Tuple[int, float]]: Positions of the closest candidates and
+            their exact angles to the query in radians, closest first.
+            Fewer than k pairs are returned if there are fewer candidates.
+
+        Raises:
+            ValueError: If the query has another dimension or is zero.
+        """
+        query_length = vector_length(query)
+        if query_length == 0:
+            raise ValueError("One of the vectors is zero.")
+        lengths = self.vectors.lengths
+
+        cosines = (
+            (
+                dot_product(query, self.vectors.vector(position))
+                / (query_length * lengths[position]),
+                position,
+            )
+            for position in sorted(self.candidates(query))
+        )
+        best = heapq.nlargest(k, cosines, key=itemgetter(0))
+        return [(index, math.acos(max(-1, min(1, cosine)))) for cosine, index in best]
+
+    def recall(self, queries: Iterable[Sequence[float]], k: int) -> float:
+        """
+        Measures the share of the exact top k vectors that the index finds.
+
+        Args:
+            queries (Iterable[Sequence[float]]): Sample query vectors.
+            k (int): The number of vectors requested per query.
+
+        Returns:
+            float: Recall at k averaged over the queries, from 0 to 1.
+        """
+        found = expected = 0
+        for query in queries:
+            exact = {position for position, _ in self.vectors.top_k_similar(query, k)}
+            approximate = {position for position, _ in self.top_k_similar(query, k)}
+            found += len(exact & approximate)
+            expected += len(exact)
+        return found / expected if expected else 1.0
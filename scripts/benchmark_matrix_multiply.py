@@ -0,0 +1,108 @@
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+from project.matrix_operation import multiply_matrices, parallel_multiply_matrices
+
+
+def textbook_multiply(
+    matrix1: List[List[float]], matrix2: List[List[float]]
+) -> List[List[float]]:
+    """The i-j-k kernel used before the row-streaming/blocked kernels."""
+    result = [[0.0 for _ in range(len(matrix2[0]))] for _ in range(len(matrix1))]
+    for i in range(len(matrix1)):
+        for j in range(len(matrix2[0])):
+            for k in range(len(matrix2)):
+                result[i][j] += matrix1[i][k] * matrix2[k][j]
+    return result
+
+
+def random_matrix(rows: int, columns: int) -> List[List[float]]:
+    return [[random.random() for _ in range(columns)] for _ in range(rows)]
+
+
+def measure(func: Callable[[], List[List[float]]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multiply_matrices.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 200, 500],
+        help="Matrix sizes to time. The full sweep, --sizes 100 200 500 1000 "
+        "2000, takes hours because of the textbook kernel; add "
+        "--skip-textbook-above 500 to shorten it.",
+    )
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Also time parallel_multiply_matrices with these worker counts.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per kernel, the best one is reported. Sizes above 500 "
+        "are run once.",
+    )
+    parser.add_argument(
+        "--skip-textbook-above",
+        type=int,
+        default=None,
+        help="Do not run the slow textbook kernel for larger sizes. "
+        "By default it runs for every size.",
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        matrix1 = random_matrix(size, size)
+        matrix2 = random_matrix(size, size)
+        expected = multiply_matrices(matrix1, matrix2, block_size=0)
+
+        repeat = args.repeat if size <= 500 else 1
+        timings = {}
+        if args.skip_textbook_above is None or size <= args.skip_textbook_above:
+            assert textbook_multiply(matrix1, matrix2) == expected
+            timings["textbook"] = measure(
+                lambda: textbook_multiply(matrix1, matrix2), repeat
+            )
+        timings["rows"] = measure(
+            lambda: multiply_matrices(matrix1, matrix2, block_size=0), repeat
+        )
+        for block_size in args.block_sizes:
+            assert multiply_matrices(matrix1, matrix2, block_size) == expected
+            timings[f"block={block_size}"] = measure(
+                lambda: multiply_matrices(matrix1, matrix2, block_size), repeat
+            )
+        for workers in args.workers:
+            assert parallel_multiply_matrices(matrix1, matrix2, workers) == expected
+            timings[f"workers={workers}"] = measure(
+                lambda: parallel_multiply_matrices(matrix1, matrix2, workers),
+                repeat,
+            )
+
+        baseline_name = "textbook" if "textbook" in timings else "rows"
+        baseline = timings[baseline_name]
+        print(f"{size}x{size} (speedup over {baseline_name}):")
+        for name, seconds in timings.items():
+            print(f"  {name:>12}: {seconds:8.3f}s  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import pytest
+import math
+import sys
+import os
+from array import array
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from project import backends
+from project.backends import (
+    Backend,
+    available_backends,
+    get_backend,
+    register_backend,
+    select_backend,
+)
+from project.matrix_operation import Matrix, SparseMatrix
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return get_backend(request.param)
+
+
+def test_dot_product_length_mismatch(backend):
+    with pytest.raises(ValueError):
+        backend.dot_product([1, 2], [1, 2, 3])
+
+
+@pytest.mark.parametrize("size", [2, 64])
+def test_matrix_inputs_keep_representation(backend, size):
+    rows = [[float(i * size + j) for j in range(size)] for i in range(size)]
+    identity = [[float(i == j) for j in range(size)] for i in range(size)]
+    matrix = Matrix.from_lists(rows)
+
+    product = backend.multiply_matrices(matrix, identity)
+    assert isinstance(product, Matrix)
+    assert product == rows
+    total = backend.add_matrices(matrix, matrix)
+    assert isinstance(total, Matrix)
+    assert total == [[2 * value for value in row] for row in rows]
+
+    # Транспонирование Matrix остаётся представлением без копирования
+    transposed = backend.transpose(matrix)
+    assert isinstance(transposed, Matrix)
+    assert transposed.data is matrix.data
+    product = backend.multiply_matrices(transposed, identity)
+    assert product == [list(column) for column in zip(*rows)]
+
+
+def test_select_backend(monkeypatch):
+    assert select_backend([1, 2], [3, 4]).name == "python"
+    assert select_backend(array("d", [1, 2]), [3, 4]).name == "array"
+    assert select_backend(Matrix.from_lists([[1]])).name == "array"
+    sparse = SparseMatrix.from_coo((1, 1), [0], [0], [1.0])
+    assert select_backend(sparse, Matrix.from_lists([[1]])).name == "python"
+
+    large = [1.0] * backends.NUMPY_THRESHOLD
+    expected = "numpy" if "numpy" in available_backends() else "python"
+    assert select_backend(large, large).name == expected
+
+    # Явно указанный бэкенд важнее автоматического выбора
+    assert backends.dot_product([1, 2], [3, 4], backend="array") == 11
+    with pytest.raises(KeyError):
+        backends.dot_product([1, 2], [3, 4], backend="missing")
+
+
+def test_backends_must_implement_all_operations():
+    class DotOnly(Backend):
+        name = "dot-only"
+
+        def dot_product(self, a, b):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        register_backend(DotOnly())
+
+
+def test_dispatch_functions():
+    assert backends.dot_product([1, 2, 3], [4, 5, 6]) == 32
+    assert backends.vector_length(array("d", [3, 4])) == 5
+    assert backends.angle_between_vectors([1, 0], [1, 0]) == 0
+    assert backends.add_matrices([[1]], [[2]]) == [[3]]
+    assert backends.multiply_matrices([[2]], [[3]]) == [[6]]
+    assert backends.transpose(Matrix.from_lists([[1, 2]])) == [[1], [2]]
+
+
+def test_numpy_backend_keeps_ndarrays():
+    numpy = pytest.importorskip("numpy")
+    backend = get_backend("numpy")
+    matrix = numpy.array([[1.0, 2.0], [3.0, 4.0]])
+
+    result = backend.multiply_matrices(matrix, matrix)
+    assert isinstance(result, numpy.ndarray)
+    assert result.tolist() == [[7, 10], [15, 22]]
+    assert select_backend(matrix, matrix) is backend
+
+
+def test_numpy_backend_views_matrix_buffers():
+    numpy = pytest.importorskip("numpy")
+    matrix = Matrix.from_lists([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    view = backends._as_array(matrix.T)
+    assert view.tolist() == [[1, 4], [2, 5], [3, 6]]
+    assert numpy.shares_memory(view, numpy.frombuffer(matrix.data))
@@ -0,0 +1,129 @@
+import pytest
+import math
+import struct
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from project.binary_format import (
+    HEADER_SIZE,
+    iter_vector_file,
+    load_matrix,
+    load_vector,
+    save_matrix,
+    save_vector,
+)
+from project.matrix_operation import Matrix, add_matrices, multiply_matrices
+from project.vector_operation import (
+    angle_between_vectors,
+    dot_product,
+    stream_dot_product,
+)
+
+
+def test_matrix_round_trip(tmp_path):
+    path = str(tmp_path / "matrix.bin")
+    matrix = [[1.5, 2, 3], [4, 5, 6.25]]
+    save_matrix(path, matrix)
+
+    assert os.path.getsize(path) == HEADER_SIZE + 6 * 8
+    loaded = load_matrix(path)
+    assert isinstance(loaded.data, memoryview)
+    assert loaded.shape == (2, 3)
+    assert loaded == matrix
+
+    # Загруженные матрицы можно сразу передавать в операции
+    assert multiply_matrices(loaded, loaded.T) == multiply_matrices(
+        matrix, [[1.5, 4], [2, 5], [3, 6.25]]
+    )
+    assert add_matrices(loaded, matrix) == [[3, 4, 6], [8, 10, 12.5]]
+
+    # Транспонированное представление сохраняется построчно
+    save_matrix(path, Matrix.from_lists(matrix).T)
+    assert load_matrix(path) == [[1.5, 4], [2, 5], [3, 6.25]]
+
+
+def test_load_matrix_writable(tmp_path):
+    path = str(tmp_path / "matrix.bin")
+    save_matrix(path, [[1, 2], [3, 4]])
+
+    with pytest.raises(TypeError):
+        load_matrix(path)[0, 0] = 10
+
+    loaded = load_matrix(path, writable=True)
+    loaded[0, 0] = 10
+    assert loaded == [[10, 2], [3, 4]]
+    # Изменения не попадают в файл
+    assert load_matrix(path) == [[1, 2], [3, 4]]
+
+
+def test_vector_round_trip(tmp_path):
+    path1 = str(tmp_path / "a.bin")
+    path2 = str(tmp_path / "b.bin")
+    save_vector(path1, [1, 0])
+    save_vector(path2, [0, 2])
+
+    a = load_vector(path1)
+    b = load_vector(path2)
+    assert list(a) == [1.0, 0.0]
+    assert dot_product(a, b) == 0
+    assert angle_between_vectors(a, b) == pytest.approx(math.pi / 2)
+
+    save_vector(path1, [])
+    assert len(load_vector(path1)) == 0
+
+
+def test_foreign_byte_order(tmp_path):
+    path = str(tmp_path / "matrix.bin")
+    order = b">" if sys.byteorder == "little" else b"<"
+    with open(path, "wb") as file:
+        file.write(struct.pack("<4sBccB2Q", b"SPBM", 1, b"d", order, 2, 1, 2))
+        file.write(struct.pack(order.decode() + "2d", 1.5, -2.0))
+
+    assert load_matrix(path) == [[1.5, -2.0]]
+
+
+def test_invalid_files(tmp_path):
+    path = str(tmp_path / "data.bin")
+    save_vector(path, [1, 2, 3])
+    with pytest.raises(ValueError):
+        load_matrix(path)
+
+    save_matrix(path, [[1, 2], [3, 4]])
+    with open(path, "ab") as file:
+        file.write(b"\0")
+    with pytest.raises(ValueError):
+        load_matrix(path)
+
+    with open(path, "wb") as file:
+        file.write(b"[[1, 2], [3, 4]]" * 4)
+    with pytest.raises(ValueError):
+        load_matrix(path)
+
+    with open(path, "wb") as file:
+        file.write(b"SPBM")
+    with pytest.raises(ValueError):
+        load_vector(path)
+
+    # Строки разной длины не записываются
+    with pytest.raises(ValueError):
+        save_matrix(str(tmp_path / "ragged.bin"), [[1.0, 2.0], [3.0]])
+    assert not os.path.exists(tmp_path / "ragged.bin")
+
+
+def test_iter_vector_file(tmp_path):
+    path1 = str(tmp_path / "a.bin")
+    path2 = str(tmp_path / "b.bin")
+    a = [float(i) for i in range(10)]
+    b = [float(10 - i) for i in range(10)]
+    save_vector(path1, a)
+    save_vector(path2, b)
+
+    assert list(iter_vector_file(path1, chunk_size=3)) == a
+    assert stream_dot_product(
+        iter_vector_file(path1, chunk_size=4), iter_vector_file(path2), chunk_size=3
+    ) == dot_product(a, b)
+
+    save_vector(path2, b[:-1])
+    with pytest.raises(ValueError):
+        stream_dot_product(iter_vector_file(path1), iter_vector_file(path2))
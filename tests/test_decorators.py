@@ -1,12 +1,26 @@
+import asyncio
 import time
 import pytest
+import subprocess
 import sys
 import os
+import threading
 from collections import OrderedDict
 
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from project.decorators import cache_result
+from project.disk_cache import DiskCache
+from project.disk_cache import hash_key
+from project.matrix_operation import Matrix, multiply_matrices
+from project.decorators import (
+    CacheInfo,
+    ContentKey,
+    content_key,
+    MaxBytes,
+    TimeToLive,
+    cache_result,
+    estimate_size,
+)
 
 
 # Test functions
@@ -78,5 +92,463 @@ def test_cache_limit():
     assert multiply(1, 2) == 2  # Should be recalculated
 
 
+def test_cache_evicts_least_recently_used():
+    calls = []
+
+    @cache_result(max_cache_size=2)
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    square(1)
+    square(2)
+    square(1)  # (1,) becomes the most recently used
+    square(3)  # This will remove (2,), not (1,)
+
+    assert square(1) == 1  # Using cache
+    assert square(2) == 4  # Should be recalculated
+    assert calls == [1, 2, 3, 2]
+
+
+def test_cache_info_and_clear():
+    @cache_result(max_cache_size=2)
+    def double(x: int) -> int:
+        return x * 2
+
+    assert double.__name__ == "double"
+    assert double.cache_info() == CacheInfo(0, 0, 0, 2, 0)
+
+    double(1)
+    double(1)
+    double(2)
+    double(3)
+    assert double.cache_info() == CacheInfo(
+        hits=1, misses=3, evictions=1, max_size=2, current_size=2
+    )
+
+    double.cache_clear()
+    assert double.cache_info() == CacheInfo(0, 0, 0, 2, 0)
+    double(1)
+    assert double.cache_info().misses == 1
+
+
+def test_cache_on_methods():
+    class Multiplier:
+        def __init__(self, factor: int) -> None:
+            self.factor = factor
+
+        @cache_result(max_cache_size=4)
+        def multiply(self, x: int) -> int:
+            return self.factor * x
+
+    double, triple = Multiplier(2), Multiplier(3)
+    assert double.multiply(3) == 6
+    assert triple.multiply(3) == 9
+    assert double.multiply(3) == 6
+    assert Multiplier.multiply(triple, x=2) == 6
+    assert double.multiply.cache_info().hits == 1
+
+
+def run_concurrently(func, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def call(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_thread_safe_cache_computes_once():
+    calls = []
+
+    @cache_result(max_cache_size=2, thread_safe=True)
+    def slow_square(x: int) -> int:
+        calls.append(x)
+        time.sleep(0.2)
+        return x * x
+
+    assert run_concurrently(lambda: slow_square(3), 8) == [9] * 8
+    assert calls == [3]
+    assert slow_square.cache_info().current_size == 1
+
+
+def test_thread_safe_cache_shares_exceptions():
+    calls = []
+
+    @cache_result(thread_safe=True)
+    def failing(x: int) -> int:
+        calls.append(x)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise RuntimeError("backend is down")
+        return x
+
+    results = run_concurrently(lambda: failing(1), 5)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 1
+
+    # Исключения не кэшируются
+    assert failing(1) == 1
+    assert len(calls) == 2
+    assert failing.cache_info().current_size == 1
+
+
+def test_thread_safe_cache_releases_waiters_when_storing_fails():
+    calls = []
+
+    def broken_size(result):
+        raise ValueError("cannot measure")
+
+    @cache_result(thread_safe=True, max_bytes=100, size_of=broken_size)
+    def identity(x: int) -> int:
+        calls.append(x)
+        time.sleep(0.1)  # Let the other callers start waiting
+        return x
+
+    results = run_concurrently(lambda: identity(1), 4)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
+    assert identity.in_flight == {}
+    with pytest.raises(ValueError):
+        identity(1)  # Does not wait for the failed computation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_expires_results_after_ttl():
+    clock = FakeClock()
+    calls = []
+
+    @cache_result(policies=[TimeToLive(10, clock=clock)])
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    square(1)
+    clock.now = 5
+    square(2)
+    clock.now = 9
+    assert square(1) == 1  # Still fresh
+    clock.now = 10
+    assert square(1) == 1  # Expired, calculated again
+    assert calls == [1, 2, 1]
+
+    clock.now = 15
+    square(3)  # Purges the expired entry for 2
+    info = square.cache_info()
+    assert info.current_size == 2
+    assert info.evictions == 2
+
+
+def test_cache_respects_memory_budget():
+    calls = []
+    measured = []
+
+    def size_of(result):
+        measured.append(result)
+        return len(result)
+
+    @cache_result(max_bytes=100, size_of=size_of)
+    def repeat(n: int) -> str:
+        calls.append(n)
+        return "x" * n
+
+    repeat(40)
+    repeat(50)
+    repeat(40)  # Mark 40 as the most recently used
+    repeat(30)  # 120 bytes in total, so 50 is evicted
+    assert repeat.cache_info().current_size == 2
+    repeat(40)
+    repeat(50)
+    assert calls == [40, 50, 30, 50]
+
+    repeat(200)  # Larger than the whole budget, so it is not cached
+    repeat(200)
+    assert calls == [40, 50, 30, 50, 200, 200]
+    assert len(measured) == len(calls)  # Each result is measured once
+
+
+def test_cache_combines_policies():
+    clock = FakeClock()
+
+    @cache_result(max_cache_size=2, policies=[TimeToLive(1, clock), MaxBytes(10, len)])
+    def identity(value: str) -> str:
+        return value
+
+    identity("aaaa")
+    identity("bbbb")
+    identity("cc")  # Over the entry limit
+    assert identity.cache_info().current_size == 2
+    identity("dddddd")  # Over the byte budget
+    assert identity.cache_info().current_size == 2
+    clock.now = 1
+    identity("e")
+    assert identity.cache_info().current_size == 1
+
+
+def test_estimate_size_follows_nested_objects():
+    flat = [0.0] * 10
+    nested = [[0.0] * 10 for _ in range(10)]
+    assert estimate_size(nested) > 10 * estimate_size(flat) > 10 * sys.getsizeof(0.0)
+    assert estimate_size({"key": flat}) > estimate_size(flat)
+
+
+def test_disk_cache_survives_restarts(tmp_path):
+    disk_cache = DiskCache(str(tmp_path / "cache.db"))
+    calls = []
+
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    first = cache_result(max_cache_size=1, disk_cache=disk_cache, namespace="sq")(
+        square
+    )
+    assert first(2) == 4
+    assert first(3) == 9  # Evicts 2 from memory, but not from disk
+    assert first(2) == 4
+    assert first.cache_info().disk_hits == 1
+
+    # A new process would start with an empty memory cache
+    second = cache_result(
+        disk_cache=DiskCache(str(tmp_path / "cache.db")), namespace="sq"
+    )(square)
+    assert second(3) == 9
+    assert second(3) == 9
+    assert calls == [2, 3]
+    assert second.cache_info() == CacheInfo(
+        hits=1, misses=1, evictions=0, max_size=0, current_size=1, disk_hits=1
+    )
+
+    second.cache_clear()
+    assert second(3) == 9
+    assert calls == [2, 3, 3]
+
+
+def test_disk_cache_requires_unique_namespace(tmp_path):
+    disk_cache = DiskCache(str(tmp_path / "cache.db"))
+
+    def make(n):
+        def add(x):
+            return x + n
+
+        return add
+
+    with pytest.raises(ValueError):
+        cache_result(disk_cache=disk_cache)(make(1))
+
+    first = cache_result(disk_cache=disk_cache, namespace="add-1")(make(1))
+    second = cache_result(disk_cache=disk_cache, namespace="add-100")(make(100))
+    assert first(10) == 11
+    assert second(10) == 110
+
+
+def test_disk_cache_errors_do_not_fail_calls(tmp_path, caplog):
+    disk_cache = DiskCache(str(tmp_path / "cache.db"))
+
+    @cache_result(disk_cache=disk_cache, namespace="unpicklable")
+    def view(x: int) -> memoryview:
+        return memoryview(bytes([x]))
+
+    assert view(1)[0] == 1  # Results cannot be pickled
+    assert view(1)[0] == 1
+    assert view.cache_info().hits == 1
+    assert "Disk cache store failed" in caplog.text
+
+
+def test_async_cache_stores_awaited_results():
+    calls = []
+
+    @cache_result(max_cache_size=2)
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0)
+        return x * 10
+
+    async def main():
+        assert await fetch(1) == 10
+        assert await fetch(1) == 10  # Не повторно ожидаемая корутина
+        assert await fetch(x=2) == 20
+
+    asyncio.run(main())
+    assert calls == [1, 2]
+    assert fetch.cache_info().hits == 1
+
+
+def test_async_cache_shares_in_flight_calls():
+    calls = []
+
+    @cache_result()
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        if x < 0:
+            raise ValueError("negative")
+        return x
+
+    async def main():
+        assert await asyncio.gather(*(fetch(1) for _ in range(5))) == [1] * 5
+        results = await asyncio.gather(
+            *(fetch(-1) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await fetch(-1)  # Исключения не кэшируются
+
+    asyncio.run(main())
+    assert calls == [1, -1, -1]
+
+
+def test_async_cache_cancellation():
+    calls = []
+
+    @cache_result()
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.05)
+        return x
+
+    async def main():
+        # Отмена одного ожидающего не мешает остальным
+        first = asyncio.ensure_future(fetch(1))
+        second = asyncio.ensure_future(fetch(1))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == 1
+        assert first.cancelled()
+
+        # Если отменены все ожидающие, вычисление отменяется и не кэшируется
+        only = asyncio.ensure_future(fetch(2))
+        await asyncio.sleep(0.01)
+        only.cancel()
+        await asyncio.sleep(0.1)
+        assert fetch.cache_info().current_size == 1
+        assert await fetch(2) == 2
+
+        # Новый вызов сразу после отмены не получает отменяемую задачу
+        cancelled = asyncio.ensure_future(fetch(3))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert await fetch(3) == 3
+
+    asyncio.run(main())
+    assert calls == [1, 2, 2, 3, 3]
+
+
+def test_async_cache_on_methods():
+    class Client:
+        @cache_result()
+        async def get(self, x: int) -> int:
+            return x + 1
+
+    assert asyncio.run(Client().get(1)) == 2
+
+
+def test_content_key_accepts_matrices():
+    calls = []
+
+    @cache_result(key="content")
+    def multiply(matrix1, matrix2):
+        calls.append(1)
+        return multiply_matrices(matrix1, matrix2)
+
+    matrix = [[1.0, 2.0], [3.0, 4.0]]
+    assert multiply(matrix, matrix) == [[7, 10], [15, 22]]
+    assert multiply([row[:] for row in matrix], matrix) == [[7, 10], [15, 22]]
+    assert len(calls) == 1
+
+    # Изменённое содержимое даёт новый ключ
+    matrix[0][0] = 0.0
+    assert multiply(matrix, matrix) == [[6, 8], [12, 22]]
+    assert len(calls) == 2
+
+    packed = Matrix.from_lists(matrix)
+    assert multiply(packed, packed.T) == multiply(packed, Matrix.from_lists(matrix).T)
+    assert len(calls) == 3
+
+    with pytest.raises(TypeError):
+        cache_result()(multiply_matrices)(matrix, matrix)  # Ключ по умолчанию
+
+
+def test_content_key_distinguishes_structure():
+    assert content_key(([1, 2],), {}) == content_key(([1, 2],), {})
+    assert content_key(([1, 2],), {}) != content_key(((1, 2),), {})
+    assert content_key(([[1], [2]],), {}) != content_key(([1, 2],), {})
+    assert content_key((), {"a": [1], "b": {2}}) == content_key(
+        (), {"b": {2}, "a": [1]}
+    )
+    with pytest.raises(TypeError):
+        content_key((object.__new__(type("Opaque", (), {"__hash__": None})),), {})
+
+
+def test_content_key_checks_equality_on_hash_collision():
+    first, second = ContentKey(("a",)), ContentKey(("b",))
+    second.hash = first.hash
+    assert first != second
+    assert len({first, second}) == 2
+
+
+CONTENT_DIGEST_SCRIPT = """
+from project.decorators import content_key
+from project.disk_cache import hash_key
+args = ([1.0, 2.0], {"alpha": [1, 2], "beta": {"x", "y", "z"}, "gamma": None})
+kwargs = {"mode": "fast", "limit": 10, "tags": frozenset({"a", "b", "c"})}
+print(hash_key(content_key(args, kwargs)))
+"""
+
+
+def test_content_key_is_stable_on_disk():
+    # Хеши строк зависят от PYTHONHASHSEED, а ключи на диске — нет
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    digests = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        digests.add(
+            subprocess.run(
+                [sys.executable, "-c", CONTENT_DIGEST_SCRIPT],
+                cwd=root,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+    assert len(digests) == 1
+
+
+def test_custom_key_function():
+    calls = []
+
+    @cache_result(key=lambda records, limit=10: (len(records), limit))
+    def summarize(records, limit=10):
+        calls.append(limit)
+        return sum(records[:limit])
+
+    assert summarize([1, 2, 3]) == 6
+    assert summarize([1, 2, 3], limit=10) == 6
+    assert summarize([1, 2, 3], limit=2) == 3
+    assert calls == [10, 2]
+
+    with pytest.raises(ValueError):
+        cache_result(key="unknown")(summarize)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from project.disk_cache import DiskCache, hash_key
+
+
+def test_get_returns_stored_results(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    assert cache.get("f", (1,)) == (False, None)
+    cache.set("f", (1,), [1.0, 2.0])
+    assert cache.get("f", (1,)) == (True, [1.0, 2.0])
+    assert cache.get("g", (1,)) == (False, None)  # Namespaces are separate
+    assert len(cache) == 1
+
+
+def test_results_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    DiskCache(path).set("f", ((2,), frozenset()), 4)
+    assert DiskCache(path).get("f", ((2,), frozenset())) == (True, 4)
+
+
+def test_hash_key_ignores_set_order():
+    key1 = ((), frozenset({("a", 1), ("b", 2), ("c", 3)}))
+    key2 = ((), frozenset([("c", 3), ("a", 1), ("b", 2)]))
+    assert hash_key(key1) == hash_key(key2)
+    assert hash_key(((1,), frozenset())) != hash_key(((2,), frozenset()))
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(
+        str(tmp_path / "cache.db"), max_bytes=250, serialize=bytes, deserialize=bytes
+    )
+    cache.set("f", 1, b"a" * 100)
+    cache.set("f", 2, b"b" * 100)
+    cache.get("f", 1)
+    cache.set("f", 3, b"c" * 100)
+    assert cache.get("f", 2) == (False, None)
+    assert cache.get("f", 1)[0] and cache.get("f", 3)[0]
+    assert cache.total_size() == 200
+
+    cache.set("f", 4, b"d" * 300)  # Larger than the cap
+    assert cache.get("f", 4) == (False, None)
+
+
+def test_clear(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    cache.set("f", 1, 1)
+    cache.set("g", 1, 1)
+    cache.clear("f")
+    assert cache.get("f", 1)[0] is False and cache.get("g", 1)[0] is True
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_size_cap(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCache(str(tmp_path / "cache.db"), max_bytes=0)
+
+
+def test_total_size_follows_replacements_and_clears(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"), serialize=bytes, deserialize=bytes)
+    cache.set("f", 1, b"a" * 10)
+    cache.set("f", 1, b"a" * 30)
+    cache.set("g", 1, b"b" * 5)
+    assert cache.total_size() == 35
+    cache.clear("f")
+    assert cache.total_size() == 5
+    cache.clear()
+    assert cache.total_size() == 0
+
+
+def test_hits_are_recorded_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr("project.disk_cache.ACCESS_BATCH_SIZE", 2)
+    cache = DiskCache(
+        str(tmp_path / "cache.db"), max_bytes=250, serialize=bytes, deserialize=bytes
+    )
+    for key in (1, 2, 3):
+        cache.set("f", key, b"x" * 50)
+    cache.get("f", 1)
+    cache.get("f", 2)  # Writes both access times
+    cache.set("f", 4, b"x" * 101)
+    assert cache.get("f", 3) == (False, None)
+
+
+def fill(path, start):
+    cache = DiskCache(path)
+    for i in range(start, start + 50):
+        cache.set("f", i, i * i)
+        assert cache.get("f", i) == (True, i * i)
+    cache.close()
+
+
+def test_concurrent_access_from_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=3, mp_context=context) as executor:
+        list(executor.map(fill, [path] * 3, [0, 50, 100]))
+    cache = DiskCache(path)
+    assert len(cache) == 150
+    assert all(cache.get("f", i) == (True, i * i) for i in range(150))
+
+
+def test_concurrent_access_from_threads(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    threads = [threading.Thread(target=fill, args=(cache.path, i)) for i in (0, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 100
+
+
+def use_in_child(cache, queue):
+    try:
+        queue.put(cache.get("f", 1))
+    except RuntimeError as error:
+        queue.put(type(error).__name__)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_cache_must_be_closed_before_fork(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    cache.set("f", 1, 1)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    for expected in ("RuntimeError", (True, 1)):
+        child = context.Process(target=use_in_child, args=(cache, queue))
+        child.start()
+        assert queue.get(timeout=30) == expected
+        child.join()
+        cache.close()  # Allows the next child to use the cache
@@ -0,0 +1,75 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from project.lazy_matrix import Expression, Leaf, Product, Sum, Transpose, lazy
+from project.matrix_operation import (
+    Matrix,
+    add_matrices,
+    multiply_matrices,
+    transpose,
+)
+
+
+def random_matrix(rng, rows, columns):
+    return [[rng.uniform(-10, 10) for _ in range(columns)] for _ in range(rows)]
+
+
+def assert_close(result, expected):
+    assert len(result) == len(expected)
+    for row, expected_row in zip(result, expected):
+        assert row == pytest.approx(expected_row)
+
+
+def test_expression_graph():
+    a = lazy([[1, 2, 3], [4, 5, 6]])
+    expression = a @ a.T + [[1, 0], [0, 1]]
+
+    # Граф строится без вычислений
+    assert isinstance(expression, Sum)
+    assert isinstance(expression.left, Product)
+    assert isinstance(expression.left.right, Transpose)
+    assert isinstance(expression.right, Leaf)
+    assert expression.shape == (2, 2)
+    assert a.T.T is a
+
+    assert expression.evaluate() == [[15, 32], [32, 78]]
+
+
+@pytest.mark.parametrize("as_matrix", [False, True])
+def test_fused_product_matches_eager(as_matrix):
+    rng = random.Random(7)
+    a = random_matrix(rng, 5, 4)
+    b = random_matrix(rng, 6, 4)
+    c = random_matrix(rng, 5, 6)
+    d = random_matrix(rng, 4, 6)
+    wrap = Matrix.from_lists if as_matrix else (lambda matrix: matrix)
+
+    expected = add_matrices(multiply_matrices(a, transpose(b)), c)
+    assert_close((lazy(wrap(a)) @ lazy(wrap(b)).T + wrap(c)).evaluate(), expected)
+    assert_close((wrap(c) + lazy(wrap(a)) @ lazy(wrap(b)).T).evaluate(), expected)
+
+    expected = multiply_matrices(transpose(d), transpose(a))
+    assert_close((lazy(wrap(d)).T @ lazy(wrap(a)).T).evaluate(), expected)
+
+    expected = add_matrices(add_matrices(a, transpose(d)[:5]), a)
+    assert_close((lazy(a) + lazy(d).T.evaluate()[:5] + a).evaluate(), expected)
+
+    # Вложенные произведения вычисляются как промежуточные матрицы
+    expected = transpose(multiply_matrices(multiply_matrices(a, d), transpose(c)))
+    assert_close(((lazy(wrap(a)) @ wrap(d)) @ lazy(wrap(c)).T).T.evaluate(), expected)
+
+
+def test_invalid_expressions():
+    a = lazy([[1, 2], [3, 4]])
+
+    with pytest.raises(ValueError):
+        a @ [[1, 2]]
+    with pytest.raises(ValueError):
+        a + [[1, 2]]
+    with pytest.raises(ValueError):
+        lazy([]) @ a
+    with pytest.raises(TypeError):
+        Expression((1, 1))  # Only concrete nodes can be evaluated
@@ -1,97 +1,363 @@
 import pytest
+import random
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from project.backends import available_backends, get_backend
 from project.matrix_operation import (
+    Matrix,
+    SparseMatrix,
     add_matrices,
+    batch_add,
+    batch_multiply,
+    batch_transpose,
     multiply_matrices,
+    parallel_multiply_matrices,
     transpose,
 )
 
 
-def test_add_matrices():
+# Базовые проверки выполняются для каждого доступного бэкенда
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return get_backend(request.param)
+
+
+def test_add_matrices(backend):
     # Обычное сложения
     matrix1 = [[1, 2], [3, 4]]
     matrix2 = [[5, 6], [7, 8]]
     expected_result = [[6, 8], [10, 12]]
-    assert add_matrices(matrix1, matrix2) == expected_result
+    assert backend.add_matrices(matrix1, matrix2) == expected_result
 
     # Сложение с нулевой матрицей
     matrix1 = [[0, 0], [0, 0]]
     matrix2 = [[5, 6], [7, 8]]
     expected_result = [[5, 6], [7, 8]]
-    assert add_matrices(matrix1, matrix2) == expected_result
+    assert backend.add_matrices(matrix1, matrix2) == expected_result
 
     # Сложение двух нулевых матриц
     matrix1 = [[0, 0], [0, 0]]
     matrix2 = [[0, 0], [0, 0]]
     expected_result = [[0, 0], [0, 0]]
-    assert add_matrices(matrix1, matrix2) == expected_result
+    assert backend.add_matrices(matrix1, matrix2) == expected_result
 
 
-def test_multiply_matrices():
+def test_multiply_matrices(backend):
     # Обычное умножение
     matrix1 = [[1, 2], [3, 4]]
     matrix2 = [[5, 6], [7, 8]]
     expected_result = [[19, 22], [43, 50]]
-    assert multiply_matrices(matrix1, matrix2) == expected_result
+    assert backend.multiply_matrices(matrix1, matrix2) == expected_result
 
     # Умножение на единичную матрицу
     identity_matrix = [[1, 0], [0, 1]]
-    result = multiply_matrices(matrix1, identity_matrix)
+    result = backend.multiply_matrices(matrix1, identity_matrix)
     assert result == matrix1
 
     # Умножение на нулевую матрицу
     zero_matrix = [[0, 0], [0, 0]]
     expected_result = [[0, 0], [0, 0]]
-    assert multiply_matrices(matrix1, zero_matrix) == expected_result
+    assert backend.multiply_matrices(matrix1, zero_matrix) == expected_result
 
     # Умножение неквадратных матриц
     matrix3 = [[1, 2, 3], [4, 5, 6]]
     matrix4 = [[7, 8], [9, 10], [11, 12]]
     expected_result = [[58, 64], [139, 154]]  # Результат умножения
-    assert multiply_matrices(matrix3, matrix4) == expected_result
+    assert backend.multiply_matrices(matrix3, matrix4) == expected_result
 
     # Проверка на несовместимые размеры
     matrix5 = [[1, 2], [3, 4]]
     matrix6 = [[5, 6]]
 
     try:
-        multiply_matrices(matrix5, matrix6)
+        backend.multiply_matrices(matrix5, matrix6)
         assert False, "Expected ValueError for incompatible matrices"
     except ValueError:
         pass
 
 
-def test_transpose():
+def naive_multiply(matrix1, matrix2):
+    # Эталонное умножение в порядке i-j-k
+    result = [[0.0 for _ in range(len(matrix2[0]))] for _ in range(len(matrix1))]
+    for i in range(len(matrix1)):
+        for j in range(len(matrix2[0])):
+            for k in range(len(matrix2)):
+                result[i][j] += matrix1[i][k] * matrix2[k][j]
+    return result
+
+
+@pytest.mark.parametrize("block_size", [None, 0, 1, 3, 8, 64])
+@pytest.mark.parametrize("shape", [(1, 1, 1), (5, 7, 3), (17, 9, 20), (33, 40, 31)])
+def test_multiply_matrices_kernels(shape, block_size):
+    rows, inner, columns = shape
+    rng = random.Random(sum(shape))
+    matrix1 = [[rng.uniform(-10, 10) for _ in range(inner)] for _ in range(rows)]
+    matrix2 = [[rng.uniform(-10, 10) for _ in range(columns)] for _ in range(inner)]
+
+    # Результат должен совпадать с эталоном бит в бит
+    expected_result = naive_multiply(matrix1, matrix2)
+    assert multiply_matrices(matrix1, matrix2, block_size=block_size) == expected_result
+
+
+def test_multiply_matrices_negative_block_size():
+    with pytest.raises(ValueError):
+        multiply_matrices([[1, 2], [3, 4]], [[5, 6], [7, 8]], block_size=-1)
+
+
+def test_transpose(backend):
     # Тест для обычной матрицы
     matrix = [[1, 2, 3], [4, 5, 6]]
     expected_result = [[1, 4], [2, 5], [3, 6]]
-    assert transpose(matrix) == expected_result
+    assert backend.transpose(matrix) == expected_result
 
     # Тест для квадратной матрицы
     square_matrix = [[1, 2], [3, 4]]
     expected_result_square = [[1, 3], [2, 4]]
-    assert transpose(square_matrix) == expected_result_square
+    assert backend.transpose(square_matrix) == expected_result_square
 
     # Тест для единичной матрицы
     identity_matrix = [[1]]
-    assert transpose(identity_matrix) == identity_matrix
+    assert backend.transpose(identity_matrix) == identity_matrix
 
 
-def test_add_empty_matrices():
+def test_add_empty_matrices(backend):
     empty_matrix1 = []
     empty_matrix2 = []
 
     with pytest.raises(ValueError):
-        add_matrices(empty_matrix1, empty_matrix2)
+        backend.add_matrices(empty_matrix1, empty_matrix2)
 
 
-def test_transpose_empty_matrix():
+def test_transpose_empty_matrix(backend):
     empty_matrix = []
 
-    assert transpose(empty_matrix) == []
+    assert backend.transpose(empty_matrix) == []
+
+
+def test_matrix_from_lists():
+    matrix = Matrix.from_lists([[1, 2, 3], [4, 5, 6]])
+    assert matrix.shape == (2, 3)
+    assert matrix.strides == (3, 1)
+    assert matrix[1, 2] == 6.0
+    assert matrix.tolist() == [[1, 2, 3], [4, 5, 6]]
+    assert len(matrix) == 2
+
+    with pytest.raises(ValueError):
+        Matrix.from_lists([[1, 2], [3]])
+    with pytest.raises(IndexError):
+        matrix[2, 0]
+
+
+def test_matrix_transpose_is_view():
+    matrix = Matrix.from_lists([[1, 2, 3], [4, 5, 6]])
+    transposed = transpose(matrix)
+
+    # Транспонирование не копирует данные
+    assert transposed.data is matrix.data
+    assert transposed.shape == (3, 2)
+    assert transposed == [[1, 4], [2, 5], [3, 6]]
+    assert not transposed.is_contiguous()
+    assert transposed.T == matrix
+
+    # Запись через представление видна в исходной матрице
+    transposed[2, 0] = 30
+    assert matrix[0, 2] == 30.0
+
+    copy = transposed.copy()
+    assert copy.is_contiguous()
+    assert copy == transposed
+    assert copy.data is not matrix.data
+
+
+def test_matrix_operations_accept_both_representations():
+    matrix1 = [[1, 2, 3], [4, 5, 6]]
+    matrix2 = [[7, 8], [9, 10], [11, 12]]
+    expected_product = [[58, 64], [139, 154]]
+
+    for left in (matrix1, Matrix.from_lists(matrix1)):
+        for right in (matrix2, Matrix.from_lists(matrix2)):
+            result = multiply_matrices(left, right)
+            assert result == expected_product
+            assert isinstance(result, Matrix) == (
+                isinstance(left, Matrix) or isinstance(right, Matrix)
+            )
+
+    # Транспонированные представления работают как обычные матрицы
+    matrix = Matrix.from_lists(matrix1)
+    assert multiply_matrices(matrix, matrix.T) == [[14, 32], [32, 77]]
+    assert add_matrices(matrix.T, matrix2) == [[8, 12], [11, 15], [14, 18]]
+    assert add_matrices(matrix, matrix) == [[2, 4, 6], [8, 10, 12]]
+
+    with pytest.raises(ValueError):
+        add_matrices(matrix, matrix.T)
+    with pytest.raises(ValueError):
+        multiply_matrices(matrix, matrix)
+    with pytest.raises(ValueError):
+        add_matrices(Matrix.zeros(0, 0), Matrix.zeros(0, 0))
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_multiply_matrices(monkeypatch, workers):
+    # Отключаем порог, чтобы маленькие матрицы тоже считались в процессах
+    monkeypatch.setattr("project.matrix_operation.PARALLEL_THRESHOLD", 0)
+    rng = random.Random(workers)
+    matrix1 = [[rng.uniform(-10, 10) for _ in range(9)] for _ in range(7)]
+    matrix2 = [[rng.uniform(-10, 10) for _ in range(5)] for _ in range(9)]
+    expected_result = multiply_matrices(matrix1, matrix2)
+
+    assert parallel_multiply_matrices(matrix1, matrix2, workers=workers) == (
+        expected_result
+    )
+    assert parallel_multiply_matrices(
+        matrix1, matrix2, workers=workers, block_size=2
+    ) == (expected_result)
+
+    result = parallel_multiply_matrices(
+        Matrix.from_lists(matrix1),
+        Matrix.from_lists(transpose(matrix2)).T,
+        workers=workers,
+    )
+    assert isinstance(result, Matrix)
+    assert result == expected_result
+
+
+def test_parallel_multiply_incompatible_matrices():
+    with pytest.raises(ValueError):
+        parallel_multiply_matrices([[1, 2], [3, 4]], [[5, 6]], workers=2)
+    with pytest.raises(ValueError):
+        parallel_multiply_matrices([], [[5, 6]], workers=2)
+    with pytest.raises(ValueError):
+        parallel_multiply_matrices([[1]], [[1]], workers=2, block_size=-1)
+
+
+def random_sparse(rng, rows, columns, density=0.2):
+    return [
+        [
+            float(rng.randint(-5, 5)) if rng.random() < density else 0.0
+            for _ in range(columns)
+        ]
+        for _ in range(rows)
+    ]
+
+
+def test_sparse_matrix_construction():
+    # Повторяющиеся координаты суммируются, нули отбрасываются
+    sparse = SparseMatrix.from_coo(
+        (3, 4), [0, 2, 0, 1, 1], [1, 3, 1, 0, 2], [1.0, 2.0, 3.0, 5.0, 0.0]
+    )
+    assert sparse.nnz == 3
+    assert sparse.to_dense() == [[0, 4, 0, 0], [5, 0, 0, 0], [0, 0, 0, 2]]
+    assert sparse[0, 1] == 4.0
+    assert sparse[2, 2] == 0.0
+    assert sparse.to_coo() == ([0, 1, 2], [1, 0, 3], [4.0, 5.0, 2.0])
+    assert SparseMatrix.from_dense(sparse.to_dense()) == sparse
+
+    with pytest.raises(ValueError):
+        SparseMatrix.from_coo((2, 2), [0, 2], [0, 0], [1.0, 1.0])
+    with pytest.raises(ValueError):
+        SparseMatrix.from_coo((2, 2), [0], [0, 1], [1.0])
+    with pytest.raises(IndexError):
+        sparse[3, 0]
+
+
+def test_sparse_transpose():
+    rng = random.Random(4)
+    dense = random_sparse(rng, 6, 9)
+    sparse = SparseMatrix.from_dense(dense)
+
+    transposed = transpose(sparse)
+    assert isinstance(transposed, SparseMatrix)
+    assert transposed == transpose(dense)
+    assert transposed.T == sparse
+
+
+def test_sparse_add_and_multiply():
+    rng = random.Random(5)
+    dense1 = random_sparse(rng, 7, 8)
+    dense2 = random_sparse(rng, 7, 8)
+    dense3 = random_sparse(rng, 8, 5)
+    sparse1 = SparseMatrix.from_dense(dense1)
+    sparse2 = SparseMatrix.from_dense(dense2)
+    sparse3 = SparseMatrix.from_dense(dense3)
+
+    expected_sum = add_matrices(dense1, dense2)
+    result = add_matrices(sparse1, sparse2)
+    assert isinstance(result, SparseMatrix)
+    assert result == expected_sum
+    assert add_matrices(sparse1, dense2) == expected_sum
+    assert add_matrices(dense1, sparse2) == expected_sum
+    assert isinstance(add_matrices(Matrix.from_lists(dense1), sparse2), Matrix)
+
+    expected_product = multiply_matrices(dense1, dense3)
+    result = multiply_matrices(sparse1, sparse3)
+    assert isinstance(result, SparseMatrix)
+    assert result == expected_product
+    assert multiply_matrices(sparse1, dense3) == expected_product
+    assert multiply_matrices(dense1, sparse3) == expected_product
+    result = multiply_matrices(sparse1, Matrix.from_lists(dense3))
+    assert isinstance(result, Matrix)
+    assert result == expected_product
+
+    with pytest.raises(ValueError):
+        multiply_matrices(sparse1, sparse2)
+    with pytest.raises(ValueError):
+        add_matrices(sparse1, sparse3)
+
+
+def flatten(matrices):
+    return [value for matrix in matrices for row in matrix for value in row]
+
+
+@pytest.mark.parametrize(
+    "shape1, shape2",
+    [((2, 2), (2, 2)), ((3, 3), (3, 3)), ((4, 4), (4, 4)), ((2, 3), (3, 5))],
+)
+def test_batch_multiply(shape1, shape2):
+    rng = random.Random(shape1[0] * shape2[1])
+    matrices1 = [
+        [[rng.uniform(-10, 10) for _ in range(shape1[1])] for _ in range(shape1[0])]
+        for _ in range(10)
+    ]
+    matrices2 = [
+        [[rng.uniform(-10, 10) for _ in range(shape2[1])] for _ in range(shape2[0])]
+        for _ in range(10)
+    ]
+    expected_result = flatten(
+        multiply_matrices(matrix1, matrix2)
+        for matrix1, matrix2 in zip(matrices1, matrices2)
+    )
+
+    result = batch_multiply(flatten(matrices1), flatten(matrices2), shape1, shape2)
+    assert list(result) == expected_result
+
+
+def test_batch_add_and_transpose():
+    matrices1 = [[[1, 2, 3], [4, 5, 6]], [[7, 8, 9], [10, 11, 12]]]
+    matrices2 = [[[6, 5, 4], [3, 2, 1]], [[0, 0, 0], [1, 1, 1]]]
+
+    result = batch_add(flatten(matrices1), flatten(matrices2), (2, 3))
+    assert list(result) == flatten(
+        add_matrices(matrix1, matrix2) for matrix1, matrix2 in zip(matrices1, matrices2)
+    )
+
+    result = batch_transpose(flatten(matrices1), (2, 3))
+    assert list(result) == flatten(transpose(matrix) for matrix in matrices1)
+    assert list(batch_transpose(result, (3, 2))) == flatten(matrices1)
+
+
+def test_batch_invalid_shapes():
+    with pytest.raises(ValueError):
+        batch_add([1.0] * 8, [1.0] * 4, (2, 2))
+    with pytest.raises(ValueError):
+        batch_transpose([1.0] * 7, (2, 2))
+    with pytest.raises(ValueError):
+        batch_multiply([1.0] * 8, [1.0] * 8, (2, 2), (4, 1))
+    with pytest.raises(ValueError):
+        batch_multiply([1.0] * 6, [1.0] * 6, (2, 3))
+    with pytest.raises(ValueError):
+        batch_multiply([], [], (0, 0))
 
 
 if __name__ == "__main__":
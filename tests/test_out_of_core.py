@@ -0,0 +1,76 @@
+import pytest
+import random
+import sys
+import os
+from array import array
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from project.matrix_operation import add_matrices, multiply_matrices
+from project.out_of_core import add_matrix_files, multiply_matrix_files
+
+
+def write_matrix(path, matrix):
+    with open(path, "wb") as file:
+        array("d", [value for row in matrix for value in row]).tofile(file)
+    return str(path)
+
+
+def read_matrix(path, shape):
+    with open(path, "rb") as file:
+        values = array("d", file.read())
+    rows, columns = shape
+    return [values[i * columns : (i + 1) * columns].tolist() for i in range(rows)]
+
+
+def random_matrix(rng, rows, columns):
+    return [[rng.uniform(-10, 10) for _ in range(columns)] for _ in range(rows)]
+
+
+@pytest.mark.parametrize("tile_budget", [1, 32 * 3 * 4, 32 * 3 * 49, 2**20])
+def test_multiply_matrix_files(tmp_path, tile_budget):
+    rng = random.Random(tile_budget)
+    matrix1 = random_matrix(rng, 11, 9)
+    matrix2 = random_matrix(rng, 9, 13)
+    path1 = write_matrix(tmp_path / "a.bin", matrix1)
+    path2 = write_matrix(tmp_path / "b.bin", matrix2)
+    output = str(tmp_path / "c.bin")
+
+    multiply_matrix_files(path1, path2, output, (11, 9), (9, 13), tile_budget)
+
+    # Результат совпадает с умножением в памяти бит в бит
+    assert read_matrix(output, (11, 13)) == multiply_matrices(matrix1, matrix2)
+
+
+def test_add_matrix_files(tmp_path):
+    rng = random.Random(1)
+    matrix1 = random_matrix(rng, 7, 5)
+    matrix2 = random_matrix(rng, 7, 5)
+    path1 = write_matrix(tmp_path / "a.bin", matrix1)
+    path2 = write_matrix(tmp_path / "b.bin", matrix2)
+    output = str(tmp_path / "c.bin")
+
+    add_matrix_files(path1, path2, output, (7, 5), tile_budget=32 * 3 * 4)
+
+    assert read_matrix(output, (7, 5)) == add_matrices(matrix1, matrix2)
+
+
+def test_matrix_files_errors(tmp_path):
+    path1 = write_matrix(tmp_path / "a.bin", [[1, 2], [3, 4]])
+    path2 = write_matrix(tmp_path / "b.bin", [[5, 6]])
+    output = str(tmp_path / "c.bin")
+
+    with pytest.raises(ValueError):
+        multiply_matrix_files(path1, path2, output, (2, 2), (1, 2))
+    with pytest.raises(ValueError):
+        multiply_matrix_files(path1, path2, output, (2, 2), (2, 3))
+    with pytest.raises(ValueError):
+        add_matrix_files(path1, path2, output, (2, 2))
+    with pytest.raises(ValueError):
+        add_matrix_files(path1, path1, path1, (2, 2))
+    with pytest.raises(ValueError):
+        add_matrix_files(path1, path1, output, (0, 2))
+    with pytest.raises(ValueError):
+        add_matrix_files(path1, path1, output, (2, 2), tile_budget=0)
+
+    # Входной файл не был перезаписан
+    assert read_matrix(path1, (2, 2)) == [[1, 2], [3, 4]]
@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from project.matrix_operation import Matrix
+from project.process_pool import ProcessPool
+
+
+@pytest.fixture
+def process_pool():
+    # spawn: процессы не наследуют потоки и блокировки тестового процесса
+    pool = ProcessPool(pool_size=2, mp_context=multiprocessing.get_context("spawn"))
+    yield pool
+    pool.dispose()
+
+
+def square(x):
+    return x * x
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def make_local_function():
+    return lambda: None
+
+
+def fail_unpicklable():
+    error = ValueError("unpicklable")
+    error.payload = lambda: None
+    raise error
+
+
+def total(matrix, scale=1.0):
+    rows, columns = matrix.shape
+    return scale * sum(matrix[i, j] for i in range(rows) for j in range(columns))
+
+
+def test_submit_and_map(process_pool):
+    assert process_pool.submit(square, 7).result(timeout=10) == 49
+    assert list(process_pool.map(square, range(50))) == [x * x for x in range(50)]
+    assert sorted(process_pool.map(square, range(5), ordered=False)) == [
+        0,
+        1,
+        4,
+        9,
+        16,
+    ]
+
+
+def test_exceptions_are_returned(process_pool, caplog):
+    with pytest.raises(ValueError, match="broken"):
+        process_pool.submit(fail, "broken").result(timeout=10)
+    process_pool.enqueue(os.getpid)
+    # Рабочие процессы переживают исключения в задачах
+    assert process_pool.submit(square, 3).result(timeout=10) == 9
+
+
+def test_unpicklable_task_fails_its_future(process_pool):
+    future = process_pool.submit(lambda: 1)
+    with pytest.raises(Exception):
+        future.result(timeout=10)
+    assert process_pool.submit(square, 2).result(timeout=10) == 4
+
+
+def test_bad_task_fails_only_itself():
+    pool = ProcessPool(
+        pool_size=1, batch_size=4, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        pool.submit(time.sleep, 0.5)
+        # Обе пачки уходят целиком, пока процесс занят
+        futures = [
+            pool.submit(square, 2),
+            pool.submit(make_local_function),
+            pool.submit(fail_unpicklable),
+            pool.submit(square, 3),
+            pool.submit(square, 4),
+            pool.submit(lambda: 1),
+            pool.submit(square, 5),
+            pool.submit(square, 6),
+        ]
+        assert len(pool.tasks) == 0
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=10))
+            except Exception as error:
+                results.append(type(error).__name__)
+    finally:
+        pool.dispose()
+    assert results[0] == 4 and results[3:5] == [9, 16] and results[6:] == [25, 36]
+    assert results[1] == results[2] == "PicklingError"
+    assert results[5] not in (1, None)
+
+
+def test_tasks_are_batched_while_workers_are_busy():
+    pool = ProcessPool(
+        pool_size=1, batch_size=2, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        busy = pool.submit(time.sleep, 0.5)
+        futures = [pool.submit(square, x) for x in range(3)]
+        # Две задачи ушли одной пачкой, третья ждёт, пока пачка не наберётся
+        assert len(pool.tasks) == 1
+        busy.result(timeout=10)
+        assert [future.result(timeout=10) for future in futures] == [0, 1, 4]
+    finally:
+        pool.dispose()
+
+
+def test_shared_matrix(process_pool):
+    matrix = Matrix.from_lists([[1.0, 2.0], [3.0, 4.0]])
+    shared = process_pool.share(matrix.T)
+    assert process_pool.submit(total, shared, scale=2.0).result(timeout=10) == 20.0
+    assert process_pool.submit(total, shared).result(timeout=10) == 10.0
+    empty = process_pool.share([])
+    assert process_pool.submit(total, empty).result(timeout=10) == 0
+
+
+def test_dispose_runs_queued_tasks():
+    pool = ProcessPool(pool_size=1, mp_context=multiprocessing.get_context("spawn"))
+    futures = [pool.submit(square, x) for x in range(20)]
+    pool.dispose()
+    assert [future.result(timeout=0) for future in futures] == [
+        x * x for x in range(20)
+    ]
+    with pytest.raises(RuntimeError):
+        pool.submit(square, 1)
+    pool.dispose()
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        ProcessPool(pool_size=0)
+    with pytest.raises(ValueError):
+        ProcessPool(pool_size=1, batch_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,4 +1,5 @@
 import pytest
+import queue
 import threading
 import sys
 import os
@@ -6,7 +7,7 @@ import random
 import time
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from project.threads import ThreadPool
+from project.threads import ResizeEvent, ThreadPool, as_completed, wait
 
 
 @pytest.fixture
@@ -46,6 +47,343 @@ def test_dispose(thread_pool):
     assert thread_pool.is_disposed is True
 
 
+def test_idle_workers_do_not_spin(thread_pool):
+    # Простаивающие потоки спят и не занимают процессор
+    started = time.process_time()
+    time.sleep(0.5)
+    assert time.process_time() - started < 0.05
+
+
+def test_enqueue_wakes_worker(thread_pool):
+    done = threading.Event()
+    time.sleep(0.1)  # Все потоки успевают уснуть
+    thread_pool.enqueue(done.set)
+    assert done.wait(timeout=1)
+
+
+def test_submit_returns_result(thread_pool):
+    future = thread_pool.submit(pow, 2, exp=10)
+    assert future.result(timeout=1) == 1024
+
+
+def test_submit_captures_exception(thread_pool):
+    future = thread_pool.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        future.result(timeout=1)
+    # Поток не погиб и продолжает выполнять задачи
+    assert all(thread.is_alive() for thread in thread_pool.threads)
+    assert thread_pool.submit(int, "7").result(timeout=1) == 7
+
+
+def test_failing_enqueued_task_keeps_worker_alive(caplog):
+    pool = ThreadPool(pool_size=1)
+    try:
+        pool.enqueue(lambda: 1 / 0)
+        assert pool.submit(str, 5).result(timeout=1) == "5"
+    finally:
+        pool.dispose()
+    assert "raised an exception" in caplog.text
+
+
+def test_map_ordered(thread_pool):
+    def delayed(value, delay):
+        time.sleep(delay)
+        return value
+
+    results = thread_pool.map(delayed, [1, 2, 3], [0.2, 0.1, 0])
+    assert list(results) == [1, 2, 3]
+
+
+def test_map_unordered(thread_pool):
+    def delayed(value):
+        time.sleep(value / 10)
+        return value
+
+    results = list(thread_pool.map(delayed, [3, 1, 2], ordered=False))
+    assert results == [1, 2, 3]
+
+
+def test_map_raises_failure(thread_pool):
+    results = thread_pool.map(int, ["1", "x"])
+    assert next(results) == 1
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_wait_and_as_completed(thread_pool):
+    futures = [thread_pool.submit(time.sleep, 0.1) for _ in range(3)]
+    done, not_done = wait(futures, timeout=2)
+    assert len(done) == 3 and not not_done
+    assert set(as_completed(futures)) == set(futures)
+
+
+def test_priority_tasks_run_first():
+    pool = ThreadPool(pool_size=1)
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+    try:
+        pool.enqueue(lambda: started.set() or release.wait())
+        assert started.wait(timeout=1)
+        for i in range(5):
+            pool.enqueue(lambda i=i: order.append(("bulk", i)))
+        urgent = pool.submit_priority(order.append, ("urgent", 0))
+        release.set()
+        urgent.result(timeout=1)
+        assert list(pool.map(len, [[]], priority=True)) == [0]
+    finally:
+        pool.dispose()
+    assert order[0] == ("urgent", 0)
+
+
+def test_tasks_enqueued_by_task_are_stolen(thread_pool):
+    # Задачи, поставленные из задачи, попадают в очередь её потока,
+    # а свободные потоки забирают их оттуда
+    def spawn():
+        futures = [thread_pool.submit(time.sleep, 0.2) for _ in range(4)]
+        assert len(thread_pool.tasks) >= 1
+        wait(futures)
+        return {future.done() for future in futures}
+
+    started = time.monotonic()
+    assert thread_pool.submit(spawn).result(timeout=2) == {True}
+    assert time.monotonic() - started < 0.6
+
+
+def test_many_small_tasks(thread_pool):
+    results = list(thread_pool.map(abs, range(-1000, 0)))
+    assert results == list(range(1000, 0, -1))
+
+
+def test_autoscaling_grows_and_shrinks():
+    events = []
+    pool = ThreadPool(pool_size=1, max_size=3, keep_alive=0.2, on_resize=events.append)
+    release = threading.Event()
+    try:
+        futures = [pool.submit(release.wait) for _ in range(5)]
+        assert pool.pool_size == len(pool.threads) == 3
+        assert events == [ResizeEvent(1, 2, "depth"), ResizeEvent(2, 3, "depth")]
+
+        release.set()
+        wait(futures, timeout=1)
+        deadline = time.monotonic() + 2
+        while pool.pool_size > 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool.pool_size == len(pool.threads) == 1
+        assert events[2:] == [ResizeEvent(3, 2, "idle"), ResizeEvent(2, 1, "idle")]
+        # Оставшийся поток продолжает работать
+        assert pool.submit(abs, -1).result(timeout=1) == 1
+    finally:
+        pool.dispose()
+
+
+def test_autoscaling_survives_notify_lost_to_timeout():
+    pool = ThreadPool(pool_size=1, max_size=3, keep_alive=0.02)
+    real_wait = pool.task_available.wait
+
+    def lossy_wait(timeout=None):
+        # Пробуждение, совпавшее с истечением keep_alive, выглядит как таймаут
+        woken = real_wait(timeout)
+        return woken if timeout is None else False
+
+    pool.task_available.wait = lossy_wait
+    try:
+        for _ in range(30):
+            futures = [pool.submit(time.sleep, 0.005) for _ in range(3)]
+            time.sleep(0.001)
+            futures.append(pool.submit(abs, 1))
+            _, pending = wait(futures, timeout=2)
+            assert not pending
+    finally:
+        pool.shutdown(wait=False, cancel_pending=True)
+
+
+def test_autoscaling_stress():
+    for _ in range(30):
+        pool = ThreadPool(pool_size=1, max_size=4, keep_alive=0.001)
+        futures = []
+        try:
+            for _ in range(10):
+                count = random.randint(1, 6)
+                futures += [pool.submit(time.sleep, 0.001) for _ in range(count)]
+                time.sleep(random.uniform(0, 0.002))
+            _, pending = wait(futures, timeout=5)
+            assert not pending
+        finally:
+            pool.shutdown(wait=False, cancel_pending=True)
+
+
+def test_autoscaling_on_wait_time():
+    pool = ThreadPool(pool_size=1, max_size=2, scale_up_depth=100, scale_up_wait=0.1)
+    release = threading.Event()
+    try:
+        pool.submit(release.wait)
+        pool.submit(abs, 1)
+        assert pool.pool_size == 1  # Очередь ещё короткая
+        time.sleep(0.15)
+        pool.submit(abs, 2)
+        assert pool.pool_size == 2
+    finally:
+        release.set()
+        pool.dispose()
+
+
+def test_fixed_size_by_default(thread_pool):
+    release = threading.Event()
+    for _ in range(10):
+        thread_pool.enqueue(release.wait)
+    assert thread_pool.pool_size == len(thread_pool.threads) == 5
+    release.set()
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        ThreadPool(pool_size=2, max_size=1)
+
+
+def test_bounded_queue_rejects_or_times_out():
+    release = threading.Event()
+    pool = ThreadPool(pool_size=1, max_queue_size=2, queue_timeout=0)
+    try:
+        pool.submit(release.wait)
+        time.sleep(0.1)  # Поток занят первой задачей
+        pool.enqueue(sample_task)
+        pool.submit(abs, -1)
+        with pytest.raises(queue.Full):
+            pool.enqueue(sample_task)
+        with pytest.raises(queue.Full):
+            pool.submit(abs, -2)
+
+        pool.queue_timeout = 0.1
+        started = time.monotonic()
+        with pytest.raises(queue.Full):
+            pool.submit_priority(abs, -3)
+        assert time.monotonic() - started >= 0.1
+        assert len(pool.tasks) == 2
+    finally:
+        release.set()
+        pool.dispose()
+
+
+def test_bounded_queue_blocks_producer():
+    release = threading.Event()
+    pool = ThreadPool(pool_size=1, max_queue_size=1)
+    results = []
+    try:
+        pool.submit(release.wait)
+        time.sleep(0.1)
+        producer = threading.Thread(
+            target=lambda: [
+                pool.enqueue(lambda i=i: results.append(i)) for i in range(3)
+            ]
+        )
+        producer.start()
+        time.sleep(0.2)
+        assert producer.is_alive() and len(pool.tasks) == 1  # Ждёт места в очереди
+        release.set()
+        producer.join(timeout=2)
+        assert not producer.is_alive()
+    finally:
+        release.set()
+        pool.dispose()
+    assert results == [0, 1, 2]
+
+
+def test_dispose_runs_queued_tasks():
+    pool = ThreadPool(pool_size=2)
+    results = []
+
+    def spawn():
+        time.sleep(0.1)
+        pool.enqueue(lambda: results.append("child"))
+
+    pool.enqueue(spawn)
+    futures = [pool.submit(time.sleep, 0.05) for _ in range(6)]
+    pool.dispose()
+    assert all(future.done() for future in futures)
+    assert results == ["child"]
+    assert not any(thread.is_alive() for thread in pool.threads)
+    with pytest.raises(RuntimeError):
+        pool.enqueue(sample_task)
+    with pytest.raises(RuntimeError):
+        pool.submit(abs, 1)
+
+
+def test_shutdown_cancels_pending():
+    release = threading.Event()
+    pool = ThreadPool(pool_size=1, max_queue_size=10)
+    running = pool.submit(release.wait)
+    time.sleep(0.1)
+    pending = [pool.submit(abs, -i) for i in range(5)]
+    pool.shutdown(wait=False, cancel_pending=True)
+    assert all(future.cancelled() for future in pending)
+    assert pool.tasks == []
+    assert not running.done()  # Выполняющаяся задача доработает
+    release.set()
+    assert running.result(timeout=1) is True
+    pool.shutdown()
+    assert not any(thread.is_alive() for thread in pool.threads)
+
+
+def test_metrics_disabled_by_default(thread_pool):
+    with pytest.raises(RuntimeError):
+        thread_pool.metrics()
+
+
+def test_metrics_snapshot():
+    release = threading.Event()
+    pool = ThreadPool(pool_size=2, metrics=True)
+    try:
+        pool.submit(release.wait)
+        pool.submit(release.wait)
+        time.sleep(0.1)
+        pool.enqueue(lambda: 1 / 0)
+        pool.submit(int, "x")
+        pool.submit(time.sleep, 0.05)
+        snapshot = pool.metrics()
+        assert snapshot.tasks_enqueued == 5
+        assert snapshot.queue_depth == 3
+        assert snapshot.busy_workers == 2
+
+        time.sleep(0.1)
+        release.set()
+        time.sleep(0.1)
+        pool.dispose()
+        snapshot = pool.metrics()
+    finally:
+        release.set()
+        pool.dispose()
+
+    assert snapshot.tasks_completed == 5
+    assert snapshot.tasks_failed == 2
+    assert snapshot.queue_depth == 0
+    assert snapshot.queue_wait.samples == snapshot.run_time.samples == 5
+    # Задачи ждали в очереди, пока потоки были заняты
+    assert snapshot.queue_wait.max >= 0.1
+    assert snapshot.run_time.max >= 0.1
+    assert snapshot.run_time.quantile(0.5) <= snapshot.run_time.quantile(1.0)
+    assert snapshot.run_time.quantile(1.0) == snapshot.run_time.max
+    assert 0 < snapshot.utilization <= 1
+    assert sum(count for _, count in snapshot.run_time.buckets) == 5
+
+
+def test_task_hooks():
+    events = []
+    pool = ThreadPool(
+        pool_size=1,
+        on_task_start=lambda task, wait: events.append(("start", task, wait >= 0)),
+        on_task_finish=lambda task, wait, run_time, error: events.append(
+            ("finish", task, run_time >= 0, type(error))
+        ),
+    )
+    pool.enqueue(sample_task)
+    pool.submit(int, "x")
+    pool.dispose()
+    assert events[0] == ("start", sample_task, True)
+    assert events[1] == ("finish", sample_task, True, type(None))
+    assert events[3][2:] == (True, ValueError)
+
+
 def sample_task() -> int:
     """
     A sample task that simulates work by sleeping for a random amount of time
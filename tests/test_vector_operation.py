@@ -1,28 +1,160 @@
 import pytest
 import math
+import random
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
-from project.vector_operation import dot_product, vector_length, angle_between_vectors
+from project.backends import available_backends, get_backend
+from project.vector_operation import (
+    AngularLSHIndex,
+    VectorIndex,
+    dot_product,
+    stream_dot_product,
+    stream_vector_length,
+    vector_length,
+    angle_between_vectors,
+)
 
 
-def test_dot_product():
-    assert dot_product([1, 2, 3], [4, 5, 6]) == 32
-    assert dot_product([0, 0, 0], [1, 2, 3]) == 0
-    assert dot_product([-1, -2], [1, 2]) == -5
+# Базовые проверки выполняются для каждого доступного бэкенда
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return get_backend(request.param)
 
 
-def test_vector_length():
-    assert vector_length([3, 4]) == 5
-    assert vector_length([0, 0]) == 0
-    assert vector_length([1, 2, 2]) == 3
+def test_dot_product(backend):
+    assert backend.dot_product([1, 2, 3], [4, 5, 6]) == 32
+    assert backend.dot_product([0, 0, 0], [1, 2, 3]) == 0
+    assert backend.dot_product([-1, -2], [1, 2]) == -5
 
 
-def test_angle_between_vectors():
-    assert angle_between_vectors([1, 0], [0, 1]) == pytest.approx(
+def test_vector_length(backend):
+    assert backend.vector_length([3, 4]) == 5
+    assert backend.vector_length([0, 0]) == 0
+    assert backend.vector_length([1, 2, 2]) == 3
+
+
+def test_angle_between_vectors(backend):
+    assert backend.angle_between_vectors([1, 0], [0, 1]) == pytest.approx(
         math.pi / 2
     )  # Прямой угол
-    assert angle_between_vectors([1, 0], [1, 0]) == 0  # Нулевой угол
+    assert backend.angle_between_vectors([1, 0], [1, 0]) == 0  # Нулевой угол
+    with pytest.raises(ValueError):
+        backend.angle_between_vectors([0, 0], [1, 1])  # Нулевой вектор
+
+
+def test_vector_index_angles():
+    rng = random.Random(3)
+    vectors = [[rng.uniform(-1, 1) for _ in range(5)] for _ in range(20)]
+    query = [rng.uniform(-1, 1) for _ in range(5)]
+    index = VectorIndex(5, vectors)
+
+    assert len(index) == 20
+    assert list(index.vector(3)) == vectors[3]
+    assert index.angles_to(query) == [
+        angle_between_vectors(query, vector) for vector in vectors
+    ]
+
+
+def test_vector_index_top_k():
+    index = VectorIndex(2)
+    for vector in ([1, 0], [0, 1], [-1, 0], [1, 1], [1, 0.1]):
+        index.add(vector)
+
+    result = index.top_k_similar([1, 0], 3)
+    assert [position for position, _ in result] == [0, 4, 3]
+    assert result[0][1] == 0
+    assert result[2][1] == pytest.approx(math.pi / 4)
+    assert len(index.top_k_similar([1, 0], 10)) == 5
+    assert index.top_k_similar([1, 0], 0) == []
+
+
+def test_vector_index_errors():
+    index = VectorIndex(2, [[1, 2]])
+    with pytest.raises(ValueError):
+        index.add([1, 2, 3])
+    with pytest.raises(ValueError):
+        index.add([0, 0])
+    with pytest.raises(ValueError):
+        index.angles_to([0, 0])
+    with pytest.raises(ValueError):
+        index.top_k_similar([1], 1)
+    with pytest.raises(ValueError):
+        VectorIndex(0)
+
+
+def test_lsh_index_finds_near_vectors():
+    rng = random.Random(5)
+    index = AngularLSHIndex(8, tables=6, bits=8, seed=1)
+    vectors = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(300)]
+    for vector in vectors:
+        index.add(vector)
+    assert len(index) == 300
+
+    # Сам вектор всегда попадает в свои корзины
+    for position in (0, 17, 299):
+        result = index.top_k_similar(vectors[position], 1)
+        assert result[0][0] == position
+        assert result[0][1] == pytest.approx(0, abs=1e-7)
+
+    # Углы кандидатов точные
+    for position, angle in index.top_k_similar(vectors[5], 5):
+        assert angle == angle_between_vectors(vectors[5], vectors[position])
+
+
+def test_lsh_index_recall_is_tunable():
+    rng = random.Random(6)
+    vectors = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(300)]
+    queries = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(20)]
+
+    coarse = AngularLSHIndex(8, tables=1, bits=12, seed=2)
+    fine = AngularLSHIndex(8, tables=16, bits=4, seed=2)
+    for vector in vectors:
+        coarse.add(vector)
+        fine.add(vector)
+
+    assert 0 <= coarse.recall(queries, 5) < fine.recall(queries, 5) <= 1
+    assert fine.recall(queries, 5) > 0.8
+
+
+def test_lsh_index_errors():
+    index = AngularLSHIndex(2, seed=0)
+    with pytest.raises(ValueError):
+        index.add([1, 2, 3])
+    with pytest.raises(ValueError):
+        index.top_k_similar([0, 0], 1)
+    with pytest.raises(ValueError):
+        index.candidates([1])
+    with pytest.raises(ValueError):
+        AngularLSHIndex(2, tables=0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_stream_dot_product(chunk_size):
+    a = [1, 2, 3, 4, 5, 6, 7]
+    b = [7, 6, 5, 4, 3, 2, 1]
+    assert stream_dot_product(iter(a), (x for x in b), chunk_size) == dot_product(a, b)
+    assert stream_dot_product([], [], chunk_size) == 0
+    assert stream_vector_length(iter([3, 4]), chunk_size) == 5
+
+    with pytest.raises(ValueError):
+        stream_dot_product(iter(a), iter(b[:-1]), chunk_size)
+    with pytest.raises(ValueError):
+        stream_dot_product(iter(a[:-1]), iter(b), chunk_size)
+
+
+def test_stream_dot_product_is_compensated():
+    # Наивное суммирование теряет все единицы
+    a = [1e16] + [1.0] * 10000 + [-1e16]
+    b = [1.0] * len(a)
+    assert dot_product(a, b) != 10000
+    assert stream_dot_product(a, b, chunk_size=7) == 10000
+    assert stream_vector_length([0.1] * 1000000, chunk_size=1000) == pytest.approx(
+        100, rel=1e-15
+    )
+
+
+def test_stream_invalid_chunk_size():
     with pytest.raises(ValueError):
-        angle_between_vectors([0, 0], [1, 1])  # Нулевой вектор
+        stream_dot_product([1], [1], chunk_size=0)